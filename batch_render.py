@@ -0,0 +1,477 @@
+## ========================================================================================================
+## SUMMARY / خلاصه
+##
+## Batch renderer for the DXF annotation loop of "final e28 0,0,0 problem method 2.py".
+## Each database row becomes a small job (paths + dimensions). Jobs are grouped by DXF and
+## sent to a pool of worker processes; every worker renders on its own matplotlib Agg canvas,
+## draws each DXF once, puts the labels of every row on top of it and saves the PNG. Results and failures come back to the main process and are
+## collected into the same success/failure summary as the single-core script.
+##
+## INPUT / ورودی:
+## - Rows of the Excel database (Shape, Subshape, WT, H, WB, HR, Thickness, File Address, xl  =, yb  =)
+##
+## OUTPUT / خروجی:
+## - PNG images next to the DXF files, plus a list of (out_path, error) results
+## - Or, with output_format="svg"/"pdf", vector files with the labels as real (selectable) text.
+##   job["out_path"] is the output file in every format / مسیر فایل خروجی در همه فرمت‌ها
+##
+## LAYOUTS / چیدمان متن‌ها:
+## The labels follow "final e28" by default. layout="e26" or "e24" draws them like
+## "e26 with comment.py" / e24.py instead (see LAYOUTS), so those images can also be made
+## without the GUI scripts.
+##
+## Run this file directly to compare images/sec and peak memory with and without the figure pool:
+##     python batch_render.py templates
+## ========================================================================================================
+
+import os
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+## ezdxf's matplotlib backend imports pyplot, so Agg is selected first: no interactive (Tk/Qt)
+## backend is loaded in the workers, even on a desktop. Our figures are still drawn straight onto
+## their own Agg canvas and never registered with pyplot's global figure manager.
+## ezdxf خودش pyplot را import می‌کند؛ پس اول بک‌اند Agg انتخاب می‌شود
+import matplotlib
+matplotlib.use("Agg")  ## Off-screen backend, imported once per worker process / بک‌اند بدون پنجره برای هر پردازه
+from matplotlib import rc_context
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.transforms import Bbox
+from ezdxf.addons.drawing import RenderContext, Frontend, config
+from ezdxf.addons.drawing.matplotlib import MatplotlibBackend
+
+import dxf_cache
+from excel_rows import isna
+from label_layout import (LABEL_GAP, SECTION_NAME_OFFSET, SUBSHAPE_OFFSET, SUBSHAPE_OFFSET_THIN,
+                          THIN_WALL, layout_for_styled_jobs, positions)
+from sheet_cache import iter_sheet_rows
+
+
+FILE_COL = "File Address"  ## Column with the .sct path / ستون مسیر فایل
+RENDER_DPI = 300
+FIGSIZE = (6, 6)
+BBOX_PAD = 0.1  ## Inches around the drawing, same as matplotlib's savefig.pad_inches / حاشیه تصویر
+
+## ---------- Output formats / فرمت‌های خروجی ----------
+## SVG/PDF keep the DXF as vector paths; text stays text instead of glyph outlines
+## خروجی برداری: هندسه به صورت مسیر و متن به صورت متن واقعی
+OUTPUT_FORMATS = ("png", "svg", "pdf")
+VECTOR_RC = {"svg.fonttype": "none", "pdf.fonttype": 42}
+
+LAYOUT_CHUNK = 512  ## Rows per columnar layout pass / تعداد ردیف در هر محاسبه ستونی مختصات
+
+## ---------- Label layouts of the scripts / چیدمان متن‌های هر اسکریپت ----------
+## e28 draws the DXF black on white and writes bold labels, with the Subshape label moved up
+## further for thin step beams. e26 and e24 kept ezdxf's own colours, normal weight labels and
+## Subshape 0.2 above Th for every shape; e24 also wrote "H:" where the others write "HL:".
+LAYOUTS = {
+    "e28": {"subshape_offset": SUBSHAPE_OFFSET, "subshape_offset_thin": SUBSHAPE_OFFSET_THIN,
+            "fontweight": "bold", "h_label": "HL", "black_on_white": True},
+    "e26": {"subshape_offset": 0.2, "subshape_offset_thin": 0.2,
+            "fontweight": "normal", "h_label": "HL", "black_on_white": False},
+    "e24": {"subshape_offset": 0.2, "subshape_offset_thin": 0.2,
+            "fontweight": "normal", "h_label": "H", "black_on_white": False},
+}
+DEFAULT_LAYOUT = "e28"
+
+## Everything besides the row values and the DXF that changes the PNG; part of the manifest hash
+## هر چیزی جز مقادیر ردیف و DXF که روی خروجی اثر دارد
+RENDER_SETTINGS = {
+    "dpi": RENDER_DPI,
+    "figsize": FIGSIZE,
+    "bbox_inches": "computed",
+    "bbox_pad": BBOX_PAD,
+    "label_gap": LABEL_GAP,
+    "layouts": LAYOUTS,
+    "thin_wall": THIN_WALL,
+    "section_name_offset": SECTION_NAME_OFFSET,
+    "policy": "white-background/black-entities",
+}
+
+
+## ---------- Build a job from one database row / ساخت کار از یک ردیف دیتابیس ----------
+def job_paths(row, output_format="png", output_dir=None):
+    """(dxf_path, out_path) of a row: the output goes next to the DXF, or into output_dir."""
+    sct_path = os.path.normpath(str(row[FILE_COL]).strip())
+    base_path, _ = os.path.splitext(sct_path)
+    out_base = os.path.join(output_dir, os.path.basename(base_path)) if output_dir else base_path
+    return base_path + ".dxf", f"{out_base}.{output_format}"
+
+
+def build_job(row, output_format="png", output_dir=None, layout=DEFAULT_LAYOUT):
+    """Turn one DataFrame row into a plain dict that can be pickled to a worker."""
+    dxf_path, out_path = job_paths(row, output_format, output_dir)
+    return {
+        "layout": layout,
+        "section_name": str(row.get("Section Name", "")).strip(),
+        "shape": str(row["Shape"]).strip(),
+        "subshape": str(row["Subshape"]).strip(),
+        "dxf_path": dxf_path,
+        "out_path": out_path,
+        "WT": float(row["WT"]),
+        "H": float(row["H"]),
+        "WB": float(row["WB"]),
+        "HR": float(row["HR"]),
+        "TH": float(row["Thickness"]),
+        "XL": float(row["xl  ="]),
+        "YB": float(row["yb  ="]),
+        "WO": float(row.get("Brace Entering", 0)),
+    }
+
+
+## ---------- Stream jobs from the workbook / خواندن تدریجی کارها از اکسل ----------
+REQ_COLS = ["Shape", "Subshape", "WT", "H", "WB", "HR", "Thickness", FILE_COL]
+FLOAT_COLS = ["WT", "H", "WB", "HR", "Thickness", "xl  =", "yb  =", "Brace Entering"]
+JOB_COLS = REQ_COLS + ["xl  =", "yb  =", "Section Name", "Brace Entering"]
+
+
+def iter_jobs(excel_path, sheet_name=0, header=1, cache_dir=None, output_format="png", output_dir=None,
+              layout=DEFAULT_LAYOUT):
+    """
+    Yield one job per complete database row, reading the workbook row by row
+    (or from its columnar sidecar when the workbook has not changed, see sheet_cache.py).
+    Missing xl/yb columns default to 0 and rows with an empty required cell are
+    skipped, like the set-defaults + dropna steps of the single-core script.
+    A row with text that is not a number in a dimension column (e.g. "1.5in") becomes a job
+    with an "error" entry naming its Excel row, which render_batch() reports as a failed row.
+    So does a row whose output file is already taken by an earlier row of another DXF (in
+    output_dir only the file name is kept, so two folders can hold the same name), since the
+    second image would overwrite the first. A later row of the same DXF (e.g. another Subshape) writes
+    the same file too; the first row wins and the later ones are skipped with a note, so
+    the file is drawn from one row only and its manifest entry settles.
+    Label coordinates are computed for LAYOUT_CHUNK rows at a time (label_layout.py)
+    and stored in job["pos"]. output_format is one of OUTPUT_FORMATS; with output_dir
+    every file is written there instead of next to its DXF. layout is one of LAYOUTS.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format {output_format!r}, expected one of {OUTPUT_FORMATS}")
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout {layout!r}, expected one of {tuple(LAYOUTS)}")
+    rows = iter_sheet_rows(excel_path, sheet_name=sheet_name, header=header,
+                           float_cols=FLOAT_COLS, usecols=JOB_COLS, cache_dir=cache_dir, row_numbers=True)
+    chunk, taken = [], {}  ## Output file -> (Excel row, DXF) writing it / ردیف صاحب هر فایل خروجی
+    for row_no, row in rows:
+        row.setdefault("xl  =", 0)  ## اگر ستون‌های xl و yb موجود نبود، صفر بده
+        row.setdefault("yb  =", 0)
+        if any(isna(row[c]) for c in REQ_COLS if c in row):
+            continue  ## Incomplete row / ردیف ناقص
+        bad = [(c, row[c]) for c in FLOAT_COLS if isinstance(row.get(c), str)]
+        dxf_path, out_path = job_paths(row, output_format, output_dir)
+        first, first_dxf = taken.setdefault(os.path.normcase(out_path), (row_no, os.path.normcase(dxf_path)))
+        if first != row_no and first_dxf == os.path.normcase(dxf_path):
+            ## Same DXF, same file: the first row wins / ردیف اول برنده است
+            print(f"Excel row {row_no} skipped: {out_path} is already drawn from the same DXF by Excel row {first}.")
+            continue
+        if first != row_no:
+            ## Same name from another DXF: reported, not overwritten / نام تکراری از DXF دیگر
+            chunk.append({"dxf_path": dxf_path, "out_path": out_path,
+                          "error": f"Excel row {row_no} ({row.get(FILE_COL)}): {out_path} is already "
+                                   f"written by Excel row {first}; the two files have the same name"})
+        elif bad:
+            ## Not a number: reported, not skipped / مقدار غیرعددی گزارش می‌شود
+            cells = ", ".join(f"column {c!r} is not a number: {v!r}" for c, v in bad)
+            chunk.append({"dxf_path": dxf_path, "out_path": out_path,
+                          "error": f"Excel row {row_no} ({row.get(FILE_COL)}): {cells}"})
+        else:
+            chunk.append(build_job(row, output_format, output_dir, layout))
+        if len(chunk) >= LAYOUT_CHUNK:
+            yield from with_layout(chunk)
+            chunk = []
+    yield from with_layout(chunk)
+
+
+## ---------- Label coordinates / مختصات متن‌ها ----------
+def with_layout(jobs):
+    """Attach the precomputed label coordinates ({label: (x, y)}) to every job as job["pos"]."""
+    valid = [job for job in jobs if "error" not in job]
+    layout = layout_for_styled_jobs(valid, LAYOUTS)
+    for job, row in zip(valid, layout.itertuples(index=False, name=None)):
+        job["pos"] = positions(row)
+    return jobs
+
+
+def draw_labels(ax, job, pos):
+    """Add the HL/WB(WO)/HR/WT/Th/Section Name/Subshape texts on the axes and return them."""
+    style = LAYOUTS[job["layout"]]
+    weight = style["fontweight"]
+    texts = [ax.text(*pos["H"], f"{style['h_label']}: {job['H']:.2f}", ha='right', va='center', fontsize=12, color='red', fontweight=weight)]
+    if job["shape"] in ["Brace", "Post"]:
+        texts.append(ax.text(*pos["WB"], f"WO: {job['WO']:.2f}", ha='center', va='center', fontsize=12, color='blue', fontweight=weight))
+    else:
+        texts.append(ax.text(*pos["WB"], f"WB: {job['WB']:.2f}", ha='center', va='center', fontsize=12, color='blue', fontweight=weight))
+    texts.append(ax.text(*pos["HR"], f"HR: {job['HR']:.2f}", ha='left', va='center', fontsize=12, color='green', fontweight=weight))
+    texts.append(ax.text(*pos["WT"], f"WT: {job['WT']:.2f}", ha='center', va='center', fontsize=12, color='orange', fontweight=weight))
+    texts.append(ax.text(*pos["TH"], f"Th: {job['TH']:.2f}", ha='center', va='center', fontsize=14, color='purple', fontweight=weight))
+    texts.append(ax.text(*pos["SectionName"], f"\n{job['section_name']}", ha='center', va='bottom', fontsize=14, color='black'))
+    texts.append(ax.text(*pos["Subshape"], job["subshape"], ha='center', va='center', fontsize=30, color='black'))
+    return texts
+
+
+## ---------- Output frame / کادر خروجی ----------
+## bbox_inches="tight" draws the whole figure once just to measure it, then draws it again.
+## The frame is known without drawing: the DXF extents (the data limits of the geometry)
+## plus the box of every label text, measured from its font metrics.
+## کادر خروجی بدون رندر اضافه: محدوده DXF به‌علاوه کادر متن‌ها
+def output_bbox(fig, ax, texts):
+    """Bbox in inches around the drawn DXF and the label texts, padded by BBOX_PAD."""
+    ax.apply_aspect()  ## Final axes box for the equal aspect / جعبه نهایی محورها
+    renderer = fig.canvas.get_renderer()
+    boxes = [t.get_window_extent(renderer) for t in texts]
+    if ax.dataLim.width >= 0:  ## A DXF without entities has a null data box / DXF خالی
+        boxes.append(Bbox(ax.transData.transform(ax.dataLim.get_points())))
+    return Bbox.union(boxes).transformed(fig.dpi_scale_trans.inverted()).padded(BBOX_PAD)
+
+
+## ---------- Geometry layer cache / کش لایه هندسه ----------
+## The CAD drawing of a DXF is the same for every row that uses it, only the labels change.
+## Each worker keeps the last few drawn figures and puts the row's texts on top of them.
+## نقشه هر DXF برای همه ردیف‌ها یکسان است؛ فقط متن‌ها عوض می‌شوند
+MAX_GEOMETRY_FIGURES = 8
+GROUP_SIZE = 64  ## Max rows of one DXF sent to a worker at once / حداکثر ردیف یک DXF در هر ارسال
+MAX_OPEN_GROUPS = 8  ## DXFs collected at once before the oldest group is sent / حداکثر گروه باز
+_geometry = OrderedDict()
+
+## ---------- Figure pool / استخر شکل‌ها ----------
+## Evicted geometry figures are not thrown away: their artists are removed and the empty,
+## already configured figure (equal aspect, axis off) is kept for the next DXF.
+## شکل‌های خارج‌شده از کش پاک می‌شوند و برای DXF بعدی دوباره استفاده می‌شوند
+FIGURE_POOL_SIZE = 4
+_figure_pool = []
+GEOMETRY_CONFIG = config.Configuration(
+    background_policy=config.BackgroundPolicy.WHITE,  # پس‌زمینه سفید
+    color_policy=config.ColorPolicy.BLACK,            # همه‌ی موجودیت‌ها مشکی
+)
+
+
+def acquire_figure():
+    """Return an empty, configured (fig, ax), from the pool when one is free."""
+    if _figure_pool:
+        return _figure_pool.pop()
+    fig = Figure(figsize=FIGSIZE)
+    FigureCanvasAgg(fig)  ## Attaches itself as fig.canvas / بوم Agg مخصوص همین شکل
+    ax = fig.add_subplot()
+    ax.set_aspect("equal")
+    ax.axis("off")
+    return fig, ax
+
+
+def release_figure(fig, ax):
+    """Clear the drawn artists of (fig, ax) and keep it for reuse (or drop it when the pool is full)."""
+    if len(_figure_pool) >= FIGURE_POOL_SIZE:
+        return
+    for artists in (ax.lines, ax.collections, ax.patches, ax.texts, ax.images):
+        for artist in list(artists):
+            artist.remove()
+    ax.relim()          ## Forget the old data limits / حذف محدوده داده قبلی
+    ax.autoscale(True)
+    fig.set_size_inches(FIGSIZE)  ## The ezdxf backend may resize the figure / بازگرداندن اندازه شکل
+    _figure_pool.append((fig, ax))
+
+
+def geometry_axes(dxf_path, black_on_white=True):
+    """Return (fig, ax) with the DXF already drawn, rendering it only once per file version."""
+    st = os.stat(dxf_path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    key = (dxf_path, black_on_white)
+    entry = _geometry.get(key)
+    if entry is not None and entry[0] == stamp:
+        _geometry.move_to_end(key)
+        return entry[1], entry[2]
+    if entry is not None:
+        del _geometry[key]
+        release_figure(entry[1], entry[2])  ## File changed on disk / فایل روی دیسک تغییر کرده
+
+    doc = dxf_cache.readfile(dxf_path)  ## Parsed once per worker / هر DXF یک بار در هر پردازه
+    fig, ax = acquire_figure()
+    try:
+        ## e24/e26 used ezdxf's default colours / e24 و e26 با رنگ‌های پیش‌فرض ezdxf
+        cfg = GEOMETRY_CONFIG if black_on_white else config.Configuration()
+        Frontend(RenderContext(doc), MatplotlibBackend(ax), config=cfg).draw_layout(doc.modelspace())
+    except Exception:
+        release_figure(fig, ax)
+        raise
+
+    _geometry[key] = (stamp, fig, ax)
+    while len(_geometry) > MAX_GEOMETRY_FIGURES:
+        _, (_, old_fig, old_ax) = _geometry.popitem(last=False)
+        release_figure(old_fig, old_ax)
+    return fig, ax
+
+
+## ---------- Worker: render one job / پردازه کارگر: رندر یک کار ----------
+def render_job(job):
+    """Render one job to its PNG (or SVG/PDF). Returns (out_path, None) or (out_path, error message)."""
+    dxf_path, out_path = job["dxf_path"], job["out_path"]
+    if not os.path.exists(dxf_path):
+        sct_path = os.path.splitext(dxf_path)[0] + ".sct"
+        if os.path.exists(sct_path):
+            ## The outline is drawn from the DXF; the .sct cannot replace it yet (sct_reader.py)
+            return out_path, f"DXF file not found: {dxf_path}; export it from {os.path.basename(sct_path)}"
+        return out_path, f"DXF file not found: {dxf_path}"
+
+    try:
+        fig, ax = geometry_axes(dxf_path, LAYOUTS[job["layout"]]["black_on_white"])
+        pos = job["pos"] if "pos" in job else with_layout([job])[0]["pos"]
+        texts = draw_labels(ax, job, pos)
+        try:
+            os.makedirs(os.path.dirname(out_path), exist_ok=True)
+            bbox = output_bbox(fig, ax, texts)
+            if out_path.lower().endswith(".png"):
+                fig.savefig(out_path, dpi=RENDER_DPI, bbox_inches=bbox)
+            else:
+                with rc_context(VECTOR_RC):  ## Format follows the file extension / فرمت از پسوند
+                    fig.savefig(out_path, dpi=RENDER_DPI, bbox_inches=bbox)
+        finally:
+            for t in texts:
+                t.remove()  ## Keep only the geometry for the next row / فقط هندسه برای ردیف بعد بماند
+    except Exception as e:
+        return out_path, f"Error rendering {dxf_path}: {e}"
+    return out_path, None
+
+
+def render_group(jobs):
+    """Render a list of jobs that share one DXF, reusing its drawn geometry."""
+    return [render_job(job) for job in jobs]
+
+
+## ---------- Driver: send jobs to the pool / ارسال کارها به استخر پردازه‌ها ----------
+def render_batch(jobs, workers=None, manifest=None, pool=None):
+    """
+    Render all jobs, using `workers` processes (default: one per CPU core).
+    workers=1 runs in the current process, which is handy for debugging.
+    With a RenderManifest, rows whose inputs and PNG did not change are skipped.
+    A ProcessPoolExecutor passed as `pool` is used instead of a new one and left running,
+    so its workers keep their DXF and figure caches for the next call (watch mode).
+
+    `jobs` may be a generator (for example rows streamed from the workbook): jobs are
+    read one at a time, rows that share a DXF are collected into groups of at most
+    GROUP_SIZE, and only a few groups per worker are in flight at once, so the first
+    PNG is rendered right away and memory does not grow with the size of the sheet.
+    Returns the list of (out_path, error) results in job order.
+    """
+    workers = workers or os.cpu_count() or 1
+    results = []
+    hashes = {}
+    skipped = 0
+    open_groups = OrderedDict()  ## dxf_path -> [(row index, job)] not sent yet / گروه‌های ارسال‌نشده
+    pending = {}                 ## future -> row indexes / کارهای در حال اجرا
+    own_pool = pool is None
+    if own_pool and workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers)
+
+    def finish(indexes, group_results):
+        for i, r in zip(indexes, group_results):
+            results[i] = r
+            if manifest is not None and r[1] is None:
+                manifest.record(r[0], hashes.pop(i))
+
+    def send(dxf_path):
+        entries = open_groups.pop(dxf_path)
+        indexes = [i for i, _ in entries]
+        group = [job for _, job in entries]
+        if pool is None:
+            finish(indexes, render_group(group))
+            return
+        ## Keep at most two groups per worker in flight / حداکثر دو گروه برای هر پردازه
+        while len(pending) >= workers * 2:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for f in done:
+                finish(pending.pop(f), f.result())
+        pending[pool.submit(render_group, group)] = indexes
+
+    try:
+        for i, job in enumerate(jobs):
+            results.append(None)
+            if "error" in job:
+                results[i] = (job["out_path"], job["error"])  ## Bad row from iter_jobs / ردیف نامعتبر
+                continue
+
+            ## ---------- Incremental mode: skip unchanged rows / حالت افزایشی: رد کردن ردیف‌های بدون تغییر ----------
+            if manifest is not None:
+                h = manifest.job_hash(job, RENDER_SETTINGS)
+                if manifest.is_current(job["out_path"], h):
+                    results[i] = (job["out_path"], None)
+                    skipped += 1
+                    continue
+                hashes[i] = h
+
+            dxf_path = job["dxf_path"]
+            open_groups.setdefault(dxf_path, []).append((i, job))
+            if len(open_groups[dxf_path]) >= GROUP_SIZE:
+                send(dxf_path)
+            elif len(open_groups) > MAX_OPEN_GROUPS:
+                send(next(iter(open_groups)))  ## Oldest DXF / قدیمی‌ترین DXF
+
+        while open_groups:
+            send(next(iter(open_groups)))
+        for f in list(pending):
+            finish(pending.pop(f), f.result())
+    finally:
+        if own_pool and pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    if manifest is not None:
+        print(f"Incremental build: {skipped} unchanged, {len(results) - skipped} re-rendered.")
+        manifest.save()
+    return results
+
+
+def report(results):
+    """Print every failure and return True when all rows were rendered."""
+    success = True
+    for out_path, error in results:
+        if error:
+            print(error)
+            success = False  ## یعنی حداقل یکی ناموفق بوده
+    return success
+
+
+## ---------- Benchmark: figure pool on templates/ / بنچمارک استخر شکل‌ها ----------
+def _bench(dxf_paths, rounds, pool_size, trace=False):
+    """
+    Render every DXF `rounds` times in a fresh process; returns (images, seconds, peak MB or None).
+    With trace=True the peak of the Python allocations is measured with tracemalloc (portable,
+    unlike resource/ru_maxrss, which does not exist on Windows); tracing slows rendering down,
+    so timing and memory are measured in separate runs.
+    """
+    import tempfile
+    import time
+    import tracemalloc
+
+    global FIGURE_POOL_SIZE, MAX_GEOMETRY_FIGURES
+    FIGURE_POOL_SIZE = pool_size
+    MAX_GEOMETRY_FIGURES = 1  ## Every row switches DXF, the worst case for figure churn / بدترین حالت
+    out_dir = tempfile.mkdtemp()
+    if trace:
+        tracemalloc.start()
+    n = 0
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for dxf_path in dxf_paths:
+            job = {"layout": DEFAULT_LAYOUT, "section_name": "bench", "shape": "Box Beam", "subshape": "A",
+                   "dxf_path": dxf_path, "out_path": os.path.join(out_dir, f"{n % len(dxf_paths)}.png"),
+                   "WT": 1.5, "H": 2.0, "WB": 1.5, "HR": 2.0, "TH": 0.06, "XL": 0.0, "YB": 0.0, "WO": 0.0}
+            _, error = render_job(job)
+            if error:
+                raise RuntimeError(error)
+            n += 1
+    seconds = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1] / 2**20 if trace else None
+    tracemalloc.stop()
+    return n, seconds, peak
+
+
+if __name__ == "__main__":
+    import sys
+
+    folder = sys.argv[1] if len(sys.argv) > 1 else "templates"
+    dxf_paths = sorted(os.path.join(folder, f) for f in os.listdir(folder) if f.lower().endswith(".dxf"))
+    for label, pool_size in (("no pool", 0), ("pooled", FIGURE_POOL_SIZE)):
+        ## One fresh process per run so nothing is shared between modes / پردازه جدا برای هر اجرا
+        with ProcessPoolExecutor(max_workers=1) as ex:
+            n, seconds, _ = ex.submit(_bench, dxf_paths, 10, pool_size).result()
+        with ProcessPoolExecutor(max_workers=1) as ex:
+            _, _, peak = ex.submit(_bench, dxf_paths, 10, pool_size, True).result()
+        print(f"{label:8s}: {n} images in {seconds:.2f}s ({n / seconds:.1f} images/s), "
+              f"peak traced memory {peak:.0f} MB")
@@ -0,0 +1,81 @@
+## ========================================================================================================
+## SUMMARY / خلاصه
+##
+## In-process LRU cache of parsed DXF documents. Several database rows often point at the
+## same section file (for example every Subshape variant of one step beam), so each DXF is
+## parsed once per run instead of once per row. Entries are keyed by the normalized path and
+## are invalidated when the file's mtime or size changes. Modelspace queries are cached per
+## document as well.
+##
+## USAGE / استفاده:
+##     import dxf_cache
+##     doc = dxf_cache.readfile(dxf_path)              # instead of ezdxf.readfile(dxf_path)
+##     lines = dxf_cache.query(dxf_path, "LINE ARC")   # instead of doc.modelspace().query(...)
+## ========================================================================================================
+
+import os
+from collections import OrderedDict
+
+import ezdxf
+
+MAX_DOCS = 32  ## Max number of parsed documents kept in memory / حداکثر تعداد سند در حافظه
+
+
+class DxfCache:
+    """LRU cache: normalized path -> (mtime/size stamp, parsed document, query results)."""
+
+    def __init__(self, max_docs=MAX_DOCS):
+        self.max_docs = max_docs
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def _stamp(path):
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+
+    def _entry(self, path):
+        key = os.path.normcase(os.path.abspath(path))
+        stamp = self._stamp(path)  ## Raises FileNotFoundError like ezdxf.readfile / مثل readfile خطا می‌دهد
+
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == stamp:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        ## ---------- Miss or changed file: parse again / فایل جدید یا تغییر کرده: دوباره بخوان ----------
+        self.misses += 1
+        entry = (stamp, ezdxf.readfile(path), {})
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_docs:
+            self._entries.popitem(last=False)  ## Drop least recently used / حذف قدیمی‌ترین
+        return entry
+
+    def readfile(self, path):
+        """Return the parsed document for `path`, parsing it only on first use or after a change."""
+        return self._entry(path)[1]
+
+    def query(self, path, query="*"):
+        """Return the list of modelspace entities matching `query`, cached per document."""
+        _, doc, queries = self._entry(path)
+        if query not in queries:
+            queries[query] = list(doc.modelspace().query(query))
+        return queries[query]
+
+    def clear(self):
+        self._entries.clear()
+
+
+## ---------- Module-level cache shared by the scripts / کش مشترک ----------
+_cache = DxfCache()
+
+
+def readfile(path):
+    return _cache.readfile(path)
+
+
+def query(path, query="*"):
+    return _cache.query(path, query)
@@ -0,0 +1,194 @@
+## ========================================================================================================
+## SUMMARY / خلاصه
+##
+## Lightweight extents scanner for ASCII DXF files. get_dimensions_from_dxf (e17.py) and the
+## bounding box loop of "e18 try with Cad.py" load a full ezdxf document and update min/max
+## one point at a time just to get the size of the drawing. This module memory-maps the file,
+## cuts out the ENTITIES section and splits it into group-code / value pairs with NumPy,
+## without building any entity objects:
+##
+##     ext = dxf_extents("templates/box beam 1.56 x 2.0.dxf")
+##     ext.width, ext.height, ext.center_x, ext.center_y
+##
+## Points taken, for the entity types passed as `entities` (default: all three):
+## - LINE:        start (10/20) and end (11/21)
+## - LWPOLYLINE:  every vertex (10/20)
+## - POLYLINE:    every VERTEX (10/20) of the polyline, not the POLYLINE header point
+## Each script passes the types its own loop used, so its numbers do not change:
+## - e17 (E17_ENTITIES): LWPOLYLINE only, the only queried type with vertices()
+## - e18 (E18_ENTITIES): LINE + LWPOLYLINE; POLYLINE raised inside its try and was skipped
+## Paper space entities (group code 67 = 1) are ignored, like msp queries in ezdxf.
+## The centroid is the mean of all points, as in e18. dxf_summary() also returns the entity
+## type histogram and the layer names from the same pass. Binary DXF files are read with ezdxf.
+##
+## Run this file directly for a before/after benchmark on the templates folder:
+##     python dxf_extents.py templates
+## ========================================================================================================
+
+import mmap
+import os
+import re
+import time
+from collections import namedtuple
+
+import numpy as np
+
+Extents = namedtuple("Extents", "min_x min_y max_x max_y center_x center_y count")
+Extents.width = property(lambda e: e.max_x - e.min_x)
+Extents.height = property(lambda e: e.max_y - e.min_y)
+
+DxfSummary = namedtuple("DxfSummary", "extents entity_counts layers")
+
+POINT_ENTITIES = ("LINE", "LWPOLYLINE", "POLYLINE")
+E17_ENTITIES = ("LWPOLYLINE",)
+E18_ENTITIES = ("LINE", "LWPOLYLINE")
+_SUB_ENTITIES = (b"VERTEX", b"SEQEND")
+_EMPTY = (np.empty(0), np.empty(0), np.empty(0, dtype="S1"), np.empty(0, dtype="S1"))
+_BINARY_SENTINEL = b"AutoCAD Binary DXF"
+_ENTITIES_START = re.compile(rb"^[ \t]*2[ \t]*\r?\n[ \t]*ENTITIES[ \t]*\r?\n", re.MULTILINE)
+_SECTION_END = re.compile(rb"^[ \t]*0[ \t]*\r?\n[ \t]*ENDSEC[ \t]*\r?$", re.MULTILINE)
+
+
+def _entities_section(mm):
+    """Bytes of the ENTITIES section (without the SECTION/ENDSEC markers), or b"" if missing."""
+    m = _ENTITIES_START.search(mm)
+    if m is None:
+        return b""
+    end = _SECTION_END.search(mm, m.end())
+    return mm[m.end():end.start() if end else len(mm)]
+
+
+def _group_pairs(section):
+    """(codes, values) arrays for the group-code / value line pairs of a section."""
+    lines = section.splitlines()
+    n = len(lines) // 2
+    if n == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype="S1")
+    codes = np.char.strip(np.array(lines[0:2 * n:2])).astype(np.int64)
+    values = np.char.strip(np.array(lines[1:2 * n:2]))
+    return codes, values
+
+
+def _scan(path, entities=POINT_ENTITIES):
+    """(xs, ys, entity types, layers) of the model space; entity types/layers are one per entity."""
+    with open(path, "rb") as f:
+        if f.read(len(_BINARY_SENTINEL)) == _BINARY_SENTINEL:
+            return _scan_ezdxf(path, entities)
+        if os.fstat(f.fileno()).st_size == 0:
+            return _EMPTY
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            codes, values = _group_pairs(_entities_section(mm))
+
+    ## Every pair belongs to the entity started by the last code 0 / هر جفت متعلق به آخرین موجودیت
+    starts = np.flatnonzero(codes == 0)
+    if len(starts) == 0:
+        return _EMPTY
+    entity = np.cumsum(codes == 0) - 1
+    valid = entity >= 0
+    kind = values[starts]
+
+    paper = np.zeros(len(starts), dtype=bool)
+    paper_pairs = (codes == 67) & valid
+    paper[entity[paper_pairs][values[paper_pairs].astype(np.int64) == 1]] = True
+    model = ~paper
+    ## A VERTEX counts as the POLYLINE that owns it / VERTEX جزو POLYLINE صاحبش حساب می‌شود
+    sub = np.isin(kind, _SUB_ENTITIES)
+    owner = kind[np.maximum.accumulate(np.where(sub, 0, np.arange(len(kind))))]
+    takes = np.isin(owner, [e.encode() for e in entities]) & ((kind == b"VERTEX") | ~sub) & (kind != b"POLYLINE")
+    keep = np.zeros(len(codes), dtype=bool)
+    keep[valid] = (takes & model)[entity[valid]]
+
+    is_line = np.zeros(len(codes), dtype=bool)
+    is_line[valid] = (kind == b"LINE")[entity[valid]]
+    x_mask = keep & ((codes == 10) | (is_line & (codes == 11)))
+    y_mask = keep & ((codes == 20) | (is_line & (codes == 21)))
+    xs, ys = values[x_mask].astype(np.float64), values[y_mask].astype(np.float64)
+    if len(xs) != len(ys):
+        raise ValueError(f"Unpaired point coordinates in {path}")
+
+    ## VERTEX/SEQEND belong to their POLYLINE, like in ezdxf's modelspace / زیرموجودیت‌های POLYLINE
+    top = model & ~sub
+    layer_pairs = (codes == 8) & valid
+    layer_pairs[layer_pairs] = top[entity[layer_pairs]]
+    return xs, ys, kind[top], values[layer_pairs]
+
+
+def _scan_ezdxf(path, entities=POINT_ENTITIES):
+    import ezdxf
+
+    xs, ys, kinds, layers = [], [], [], []
+    for e in ezdxf.readfile(path).modelspace():
+        kinds.append(e.dxftype())
+        layers.append(e.dxf.layer)
+        if e.dxftype() not in entities:
+            continue
+        if e.dxftype() == "LINE":
+            pts = [e.dxf.start, e.dxf.end]
+        elif e.dxftype() == "LWPOLYLINE":
+            pts = e.get_points()
+        elif e.dxftype() == "POLYLINE":
+            pts = list(e.points())
+        else:
+            continue
+        for p in pts:
+            xs.append(p[0])
+            ys.append(p[1])
+    return (np.array(xs, dtype=np.float64), np.array(ys, dtype=np.float64),
+            np.array(kinds, dtype=object), np.array(layers, dtype=object))
+
+
+def scan_points(path, entities=POINT_ENTITIES):
+    """Return (xs, ys) float64 arrays with the points of the `entities` types in the model space."""
+    return _scan(path, entities)[:2]
+
+
+def _extents(xs, ys):
+    if len(xs) == 0:
+        return None
+    return Extents(float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max()),
+                   float(xs.mean()), float(ys.mean()), len(xs))
+
+
+def dxf_extents(path, entities=POINT_ENTITIES):
+    """Extents and centroid of the drawing, or None when it has no points of the `entities` types."""
+    return _extents(*scan_points(path, entities))
+
+
+def dxf_summary(path, entities=POINT_ENTITIES):
+    """Extents of the `entities` points, {entity type: count} and the sorted layer names, in one pass."""
+    xs, ys, kinds, layers = _scan(path, entities)
+    names, counts = np.unique([_text(k) for k in kinds], return_counts=True) if len(kinds) else ([], [])
+    return DxfSummary(_extents(xs, ys), dict(zip(map(str, names), map(int, counts))),
+                      sorted({_text(layer) for layer in layers}))
+
+
+def _text(value):
+    return value.decode("utf-8", "replace") if isinstance(value, bytes) else str(value)
+
+
+if __name__ == "__main__":
+    ## ---------- Benchmark: ezdxf loop vs scanner / بنچمارک ----------
+    import sys
+
+    import ezdxf
+
+    folder = sys.argv[1] if len(sys.argv) > 1 else "templates"
+    paths = sorted(os.path.join(folder, f) for f in os.listdir(folder) if f.lower().endswith(".dxf"))
+
+    for entities in (POINT_ENTITIES, E17_ENTITIES, E18_ENTITIES):
+        t0 = time.perf_counter()
+        before = {}
+        for path in paths:
+            xs, ys = _scan_ezdxf(path, entities)[:2]
+            before[path] = (min(xs), min(ys), max(xs), max(ys)) if len(xs) else None
+        t1 = time.perf_counter()
+        after = {path: dxf_extents(path, entities) for path in paths}
+        t2 = time.perf_counter()
+
+        print("+".join(entities))
+        for path in paths:
+            ext = after[path]
+            same = (ext is None) == (before[path] is None) and (ext is None or np.allclose(ext[:4], before[path]))
+            print(f"{'ok ' if same else 'DIFF'} {os.path.basename(path)}: {ext}")
+        print(f"{len(paths)} files: ezdxf {(t1 - t0) / len(paths) * 1e3:.1f} ms/file, "
+              f"scanner {(t2 - t1) / len(paths) * 1e3:.2f} ms/file")
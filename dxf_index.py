@@ -0,0 +1,116 @@
+## ========================================================================================================
+## SUMMARY / خلاصه
+##
+## Persistent index of DXF geometry summaries. The scripts work out the same numbers from the
+## same templates on every run: extents, width/height, the center_x/center_y of e18 and the
+## entity counts. This index keeps the result of dxf_extents.dxf_summary() in a small SQLite
+## file, keyed by the sha256 of the DXF content and the entity types the extents are taken
+## from (e17 and e18 measure different types, see dxf_extents.py). A renamed or copied DXF is
+## still a hit. A DXF is only scanned again when its content changes.
+##
+## USAGE / استفاده:
+##     import dxf_index
+##     ext = dxf_index.extents(dxf_path)        # Extents(min_x, ..., center_x, center_y, count) or None
+##     ext = dxf_index.extents(dxf_path, E18_ENTITIES)   # only LINE + LWPOLYLINE points
+##     s = dxf_index.summary(dxf_path)          # DxfSummary(extents, entity_counts, layers)
+##
+## FILE / فایل:
+## - SQLite database INDEX_NAME next to this module (one row per DXF content hash and entity types)
+## ========================================================================================================
+
+import json
+import os
+import sqlite3
+
+from dxf_extents import POINT_ENTITIES, DxfSummary, Extents, dxf_summary
+from render_manifest import file_hash
+
+INDEX_NAME = "dxf_index.sqlite"
+INDEX_VERSION = 2  ## Bump when dxf_summary() changes what it measures / با تغییر اسکنر افزایش بده
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), INDEX_NAME)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS summary (
+    hash TEXT NOT NULL,
+    entities TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    min_x REAL, min_y REAL, max_x REAL, max_y REAL,
+    center_x REAL, center_y REAL, point_count INTEGER,
+    entity_counts TEXT NOT NULL,
+    layers TEXT NOT NULL,
+    PRIMARY KEY (hash, entities)
+)
+"""
+
+
+class DxfIndex:
+    """(DXF content hash, entity types) -> DxfSummary, stored in SQLite and filled on demand."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("DROP TABLE IF EXISTS dxf")  ## Version 1 table, keyed by hash only / جدول قدیمی
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def summary(self, dxf_path, entities=POINT_ENTITIES):
+        """Geometry summary of `dxf_path`, scanning the file only when its content is new."""
+        h = file_hash(dxf_path)  ## Raises FileNotFoundError for a missing DXF / خطا برای فایل ناموجود
+        key = ",".join(sorted(entities))
+        row = self._conn.execute(
+            "SELECT min_x, min_y, max_x, max_y, center_x, center_y, point_count, entity_counts, layers "
+            "FROM summary WHERE hash = ? AND entities = ? AND version = ?", (h, key, INDEX_VERSION)).fetchone()
+        if row is not None:
+            self.hits += 1
+            ext = Extents(*row[:7]) if row[6] else None
+            return DxfSummary(ext, json.loads(row[7]), json.loads(row[8]))
+
+        ## ---------- New content: scan and store / محتوای جدید: اسکن و ذخیره ----------
+        self.misses += 1
+        s = dxf_summary(dxf_path, entities)
+        ext = s.extents or Extents(None, None, None, None, None, None, 0)
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO summary VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                               (h, key, INDEX_VERSION, *ext, json.dumps(s.entity_counts), json.dumps(s.layers)))
+        return s
+
+    def extents(self, dxf_path, entities=POINT_ENTITIES):
+        return self.summary(dxf_path, entities).extents
+
+    def close(self):
+        self._conn.close()
+
+
+## ---------- Module-level index shared by the scripts / ایندکس مشترک ----------
+_index = None
+
+
+def _default():
+    global _index
+    if _index is None:
+        _index = DxfIndex()
+    return _index
+
+
+def summary(dxf_path, entities=POINT_ENTITIES):
+    return _default().summary(dxf_path, entities)
+
+
+def extents(dxf_path, entities=POINT_ENTITIES):
+    return _default().extents(dxf_path, entities)
+
+
+if __name__ == "__main__":
+    ## ---------- Index every DXF below a folder / ایندکس همه DXFهای یک پوشه ----------
+    import sys
+
+    folder = sys.argv[1] if len(sys.argv) > 1 else "templates"
+    index = _default()
+    for root, _, files in os.walk(folder):
+        for name in sorted(files):
+            if name.lower().endswith(".dxf"):
+                s = index.summary(os.path.join(root, name))
+                print(f"{name}: {s.entity_counts} layers={s.layers}")
+    print(f"{index.hits} from index, {index.misses} scanned -> {index.path}")
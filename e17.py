@@ -1,36 +1,23 @@
-import ezdxf
 from PIL import Image
 import os
 
-# تابع حذف پس‌زمینه خاکستری
-def replace_gray_with_white(img, threshold=200):
-    pixels = img.load()
-    w, h = img.size
-    for x in range(w):
-        for y in range(h):
-            r, g, b, a = pixels[x, y]
-            if a > 0:
-                if abs(r - g) < 10 and abs(g - b) < 10 and r > threshold and g > threshold and b > threshold:
-                    pixels[x, y] = (255, 255, 255, 0)
-    return img
+import dxf_index
+from dxf_extents import E17_ENTITIES
+from pixel_ops import replace_gray_with_white
+from sct_reader import sct_dimensions
 
 # خواندن ابعاد واقعی از فایل DXF
+# Extents come from the DXF index (dxf_index.py), the file is only scanned when it changed
+# Only LWPOLYLINE vertices count, as in the original vertices() loop
+# Without the DXF the size is read from the .sct next to it (sct_reader.py)
 def get_dimensions_from_dxf(file_path):
-    doc = ezdxf.readfile(file_path)
-    msp = doc.modelspace()
-    min_x, min_y, max_x, max_y = None, None, None, None
-
-    for e in msp.query("LINE CIRCLE ARC LWPOLYLINE"):
-        for p in e.vertices() if hasattr(e, "vertices") else []:
-            x, y = p[0], p[1]
-            if min_x is None or x < min_x: min_x = x
-            if min_y is None or y < min_y: min_y = y
-            if max_x is None or x > max_x: max_x = x
-            if max_y is None or y > max_y: max_y = y
-
-    width = max_x - min_x
-    height = max_y - min_y
-    return width, height
+    sct_path = os.path.splitext(file_path)[0] + ".sct"
+    if not os.path.exists(file_path) and os.path.exists(sct_path):
+        return sct_dimensions(sct_path)  # DXF هنوز ساخته نشده، ابعاد از فایل .sct
+    ext = dxf_index.extents(file_path, E17_ENTITIES)
+    if ext is None:
+        raise ValueError(f"No LWPOLYLINE geometry in {file_path}")
+    return ext.width, ext.height
 
 # پردازش داده‌ها
 def process_beam(shape, subshape, template_path, output_folder):
@@ -53,7 +40,7 @@ def process_beam(shape, subshape, template_path, output_folder):
         return
 
     img = Image.open(cad_png).convert("RGBA")
-    img = replace_gray_with_white(img)
+    img = replace_gray_with_white(img, alpha=0)
 
     output_path = os.path.join(output_folder, f"{shape}_{subshape}.png")
     img.save(output_path)
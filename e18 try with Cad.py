@@ -5,6 +5,9 @@ from ezdxf.addons.drawing.matplotlib import MatplotlibBackend
 import matplotlib.pyplot as plt
 import os
 
+import dxf_index
+from dxf_extents import E18_ENTITIES
+
 # خواندن دیتابیس
 df = pd.read_excel("data.xlsx", header=1)
 df = df.dropna(subset=["Shape", "Subshape", "WT", "H", "WB", "HR", "Thickness"])
@@ -28,29 +31,14 @@ for _, row in df.iterrows():
     doc = ezdxf.readfile(dxf_path)
     msp = doc.modelspace()
 
-    # محاسبه bounding box و جمع آوری تمام نقاط
-    min_x = min_y = float('inf')
-    max_x = max_y = float('-inf')
-    points_x = []
-    points_y = []
-
-    for e in msp:
-        try:
-            if e.dxftype() in ('LINE', 'LWPOLYLINE', 'POLYLINE'):
-                pts = []
-                if e.dxftype() == 'LINE':
-                    pts = [e.dxf.start, e.dxf.end]
-                else:
-                    pts = [p[:2] for p in e.get_points()]
-                for x, y in pts:
-                    min_x = min(min_x, x)
-                    max_x = max(max_x, x)
-                    min_y = min(min_y, y)
-                    max_y = max(max_y, y)
-                    points_x.append(x)
-                    points_y.append(y)
-        except Exception:
-            pass
+    # محاسبه bounding box و مرکز نقاط / extents + centroid from the DXF index (dxf_index.py)
+    # LINE + LWPOLYLINE points only, like the original loop (POLYLINE was skipped)
+    ext = dxf_index.extents(dxf_path, E18_ENTITIES)
+    if ext is not None:
+        min_x, min_y, max_x, max_y = ext.min_x, ext.min_y, ext.max_x, ext.max_y
+    else:
+        min_x = min_y = float('inf')
+        max_x = max_y = float('-inf')
 
     # اگر bounding box معتبر نیست، از مقادیر پیشفرض استفاده کنیم
     if min_x == float('inf') or max_x == float('-inf'):
@@ -64,8 +52,8 @@ for _, row in df.iterrows():
     if height == 0: height = 1
 
     # مرکز واقعی شکل به صورت مستقل برای هر محور
-    center_x = sum(points_x)/len(points_x) if points_x else (min_x + max_x)/2
-    center_y = sum(points_y)/len(points_y) if points_y else (min_y + max_y)/2
+    center_x = ext.center_x if ext is not None else (min_x + max_x)/2
+    center_y = ext.center_y if ext is not None else (min_y + max_y)/2
 
     # رندر با Matplotlib
     fig, ax = plt.subplots(figsize=(6, 6))
@@ -7,6 +7,8 @@ import os
 from tkinter import Tk
 from tkinter.filedialog import askopenfilename
 
+from section_records import iter_records
+
 # ---------- پنجره انتخاب فایل Excel ----------
 Tk().withdraw()  # پنهان کردن پنجره اصلی Tkinter
 excel_path = askopenfilename(title="Select Excel Database", filetypes=[("Excel files", "*.xlsx *.xls")])
@@ -31,14 +33,15 @@ FILE_COL = "File Address"
 req_cols = ["Shape", "Subshape", "WT", "H", "WB", "HR", "Thickness", FILE_COL]
 df = df.dropna(subset=[c for c in req_cols if c in df.columns])
 
-for _, row in df.iterrows():
-    section_name = str(row.get("Section Name", "")).strip()
-    shape = str(row["Shape"]).strip()
-    subshape = str(row["Subshape"]).strip()
+## ستون‌ها یک بار برای کل شیت تبدیل می‌شوند (section_records.py)
+for rec in iter_records(df):
+    section_name = rec.section_name
+    shape = rec.shape
+    subshape = rec.subshape
 
     ## ---------- ساخت مسیر DXF و PNG از روی مسیر SCT ----------
     ## مسیر SCT رو از دیتابیس بخون
-    sct_path_raw = str(row[FILE_COL]).strip()
+    sct_path_raw = rec.file_address
 
     ## نرمال‌سازی مسیر (برای UNC هم جواب می‌ده)
     sct_path = os.path.normpath(sct_path_raw)
@@ -56,14 +59,14 @@ for _, row in df.iterrows():
         continue
 
     ## ---------- خواندن مقادیر از دیتابیس ----------
-    WT = float(row["WT"])
-    H  = float(row["H"])
-    WB = float(row["WB"])
-    HR = float(row["HR"])
-    TH = float(row["Thickness"])
-    XL = float(row["xl  ="])
-    YB = float(row["yb  ="])
-    WO = float(row.get("Brace Entering", 0))  # اگر نبود، صفر
+    WT = rec.wt
+    H  = rec.h
+    WB = rec.wb
+    HR = rec.hr
+    TH = rec.thickness
+    XL = rec.xl
+    YB = rec.yb
+    WO = rec.brace_entering  # اگر نبود، صفر
 
     ## ---------- باز کردن DXF ----------
     doc = ezdxf.readfile(dxf_path)
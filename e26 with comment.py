@@ -19,13 +19,12 @@
 ## 1. Read Excel database and set default values for missing XL/YB
 ## 2. Iterate through each row, construct DXF and PNG paths
 ## 3. Read dimensions from database (H, WT, WB, HR, TH, XL, YB)
-## 4. Open DXF, calculate text label coordinates
+## 4. Calculate text label coordinates for all rows at once, open DXF
 ## 5. Render DXF and overlay text labels
 ## 6. Ensure output folder exists and save PNG
 ## ========================================================================================================
 
 import pandas as pd
-import ezdxf
 from ezdxf.addons.drawing import RenderContext, Frontend
 from ezdxf.addons.drawing.matplotlib import MatplotlibBackend
 import matplotlib.pyplot as plt
@@ -33,6 +32,9 @@ import os
 from tkinter import Tk
 from tkinter.filedialog import askopenfilename
 
+import dxf_cache
+from label_layout import compute_layout
+
 ## ---------- Excel File Selection / انتخاب فایل Excel ----------
 Tk().withdraw()  ## Hide the main Tkinter window / پنهان کردن پنجره اصلی Tkinter
 excel_path = askopenfilename(
@@ -60,10 +62,20 @@ req_cols = ["Shape", "Subshape", "WT", "H", "WB", "HR", "Thickness", FILE_COL]
 df = df.dropna(subset=[c for c in req_cols if c in df.columns])
 
 
+## ---------- Calculate text coordinates for all rows / محاسبه مختصات متن برای همه ردیف‌ها ----------
+## For all labels :
+## X coordinate : base horizontal position, shifted left or centered according to XL and spacing
+## Y coordinate : base vertical position, adjusted relative to reference height and YB offset
+## One columnar pass over the whole sheet (label_layout.py); this script keeps Subshape 0.2 above Th
+layout = compute_layout(
+    df["Shape"], df["WT"], df["H"], df["WB"], df["HR"], df["Thickness"], df["xl  ="], df["yb  ="],
+    subshape_offset=0.2, subshape_offset_thin=0.2,
+)
+
 success = True  ## برای پیگیری موفقیت
 
 ## ---------- Iterate through each row / پردازش هر ردیف ----------
-for _, row in df.iterrows():
+for (_, row), pos in zip(df.iterrows(), layout.itertuples(index=False)):
     section_name = str(row.get("Section Name", "")).strip()
     shape = str(row["Shape"]).strip()
     subshape = str(row["Subshape"]).strip()
@@ -91,42 +103,17 @@ for _, row in df.iterrows():
     WO = float(row.get("Brace Entering", 0))  ## Brace width (if shape is Brace/Post) / عرض مهاربند یا ستون، صفر اگر موجود نباشد
 
     ## ---------- Open DXF / باز کردن DXF ----------
-    doc = ezdxf.readfile(dxf_path)
+    doc = dxf_cache.readfile(dxf_path)  ## Cached: shared DXFs are parsed once / DXF مشترک فقط یک بار خوانده می‌شود
     msp = doc.modelspace()
 
-    ## ---------- Calculate text coordinates / محاسبه مختصات متن ----------
-
-    ## For all labels :
-    ## X coordinate : base horizontal position, shifted left or centered according to XL and spacing
-    ## Y coordinate : base vertical position, adjusted relative to reference height and YB offset
-    
-    ## H label 
-    H_x = -XL - (2 * TH)
-    H_y = (H / 2) - YB
-
-    ## WB label 
-    WB_x = -XL + (WB / 2)
-    WB_y = -YB - (2 * TH)
-
-    ## HR label 
-    HR_x = (-XL + WB) + (2 * TH)
-    HR_y = -YB + (HR / 2)
-
-    ## TH label 
-    TH_x = 0
-    TH_y = -YB + (HR / 2)
-
-    ## WT label
-    WT_x = -XL + (WT / 2)
-    WT_y = (H - YB) + (2 * TH)
-
-    ## Subshape label 
-    Subshape_x = 0
-    Subshape_y = TH_y + 0.2
-
-    ## Section Name 
-    SectionName_x = -XL + (WT / 2)
-    SectionName_y = (H / 2) + 0.4
+    ## ---------- Text coordinates from the layout table / مختصات متن از جدول چیدمان ----------
+    H_x, H_y = pos.H_x, pos.H_y
+    WB_x, WB_y = pos.WB_x, pos.WB_y
+    HR_x, HR_y = pos.HR_x, pos.HR_y
+    TH_x, TH_y = pos.TH_x, pos.TH_y
+    WT_x, WT_y = pos.WT_x, pos.WT_y
+    Subshape_x, Subshape_y = pos.Subshape_x, pos.Subshape_y
+    SectionName_x, SectionName_y = pos.SectionName_x, pos.SectionName_y
 
     ## ---------- Print coordinates for review / چاپ مختصات برای بررسی ----------
     # print()
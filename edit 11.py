@@ -1,13 +1,17 @@
 import os
 import re
 import pandas as pd
-from PIL import Image, ImageDraw, ImageFont, ImageChops
+from PIL import Image, ImageDraw, ImageChops
 import tkinter as tk
 from tkinter import filedialog
 
+from template_index import TemplateIndex
+from font_registry import load_font
+
 # تنظیمات اولیه
 EXCEL_FILE = "data.xlsx"
 TEMPLATES_DIR = "templates"
+TEMPLATE_INDEX = TemplateIndex(TEMPLATES_DIR)  # یک بار در شروع برنامه
 
 OUT_W, OUT_H = 1800, 2400
 
@@ -90,30 +94,7 @@ def find_template(shape, subshape=None):
         candidates.append(f"{s}.{subs}.png")
         candidates.append(f"{s}.{subs}.jpg")
     candidates += [f"{s}.png", f"{s}.jpg"]
-    for c in candidates:
-        path = os.path.join(TEMPLATES_DIR, c)
-        if os.path.exists(path):
-            return path
-    try:
-        files = os.listdir(TEMPLATES_DIR)
-    except FileNotFoundError:
-        return None
-    low_s = s.lower()
-    for fname in files:
-        if fname.lower().startswith(low_s):
-            return os.path.join(TEMPLATES_DIR, fname)
-    return None
-
-def load_font(ttf_path, size):
-    try:
-        if ttf_path and os.path.exists(ttf_path):
-            return ImageFont.truetype(ttf_path, size)
-    except Exception:
-        pass
-    try:
-        return ImageFont.load_default()
-    except Exception:
-        return None
+    return TEMPLATE_INDEX.find(candidates, prefix=s)
 
 def text_size(draw_obj, text, font):
     try:
@@ -192,8 +173,7 @@ def main():
 
         tpl_path = find_template(shape, subshape)
         if tpl_path is None:
-            default_tpl = os.path.join(TEMPLATES_DIR, "default.png")
-            tpl_path = default_tpl if os.path.exists(default_tpl) else None
+            tpl_path = TEMPLATE_INDEX.exact("default.png")
 
         canvas_img = Image.new("RGB", (OUT_W, OUT_H), color=(255, 255, 255))
         draw = ImageDraw.Draw(canvas_img)
@@ -1,16 +1,20 @@
 import pandas as pd
 from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
 from reportlab.lib.units import cm
-from reportlab.lib.utils import ImageReader
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.cidfonts import UnicodeCIDFont
 import os
 
+from pdf_shards import build_pdf
+from section_records import GRID_SPEC, CatalogRecord, iter_records
+from template_index import TemplateIndex
+from vector_catalog import catalog_image, draw_catalog_image
+
 # ---------- تنظیمات ----------
 TEMPLATES_DIR = "templates"     # پوشه تصاویر نمونه
 EXCEL_FILE = "data.xlsx"        # فایل اکسل ورودی
 OUTPUT_PDF = "output_samples.pdf"
+WORKERS = os.cpu_count()        # تعداد پردازه‌ها برای ساخت PDF (1 = یک canvas)
 
 IMAGES_PER_PAGE = 4             # 4 یا 6 معمولاً
 if IMAGES_PER_PAGE == 4:
@@ -26,6 +30,7 @@ TITLE_FONT = ("Helvetica-Bold", 12)
 TEXT_FONT = ("Helvetica", 9)
 MAX_IMG_SCALE_CM = 6            # حداکثر "بعد" داخل هر سلول (می‌تونی تغییر بدی)
 DEFAULT_TEMPLATE = os.path.join(TEMPLATES_DIR, "default.png")  # اگر مدل موجود نبود
+TEMPLATE_INDEX = TemplateIndex(TEMPLATES_DIR)  # فهرست فایل‌های نمونه، یک بار در شروع
 
 # ثبت فونت یونی‌کد برای نمایش فارسی (در صورت نیاز)
 try:
@@ -43,18 +48,9 @@ def find_template_for_name(name):
     if name is None:
         return None
     name_str = str(name).strip()
-    # try exact name with common extensions
+    # try exact name with common extensions, then case-insensitive prefix (از ایندکس، بدون listdir)
     exts = [".png", ".jpg", ".jpeg", ".bmp"]
-    for ext in exts:
-        candidate = os.path.join(TEMPLATES_DIR, name_str + ext)
-        if os.path.exists(candidate):
-            return candidate
-    # try case-insensitive search
-    for fname in os.listdir(TEMPLATES_DIR):
-        if fname.lower().startswith(name_str.lower()):
-            return os.path.join(TEMPLATES_DIR, fname)
-    # fallback
-    return None
+    return TEMPLATE_INDEX.find([name_str + ext for ext in exts], prefix=name_str)
 
 def draw_dimensions_on_cell(c, img_x, img_y, img_w, img_h, WT, WB, HR, HL):
     """
@@ -71,75 +67,90 @@ def draw_dimensions_on_cell(c, img_x, img_y, img_w, img_h, WT, WB, HR, HL):
     # Left (HL)
     c.drawRightString(img_x - 0.2*cm, img_y + img_h/2, f"HL: {HL}")
 
-# ---------- خواندن اکسل ----------
-df = pd.read_excel(EXCEL_FILE)
-
-# ---------- ایجاد PDF ----------
-c = canvas.Canvas(OUTPUT_PDF, pagesize=A4)
+# ---------- رسم کاتالوگ ----------
 page_w, page_h = A4
 cell_w = page_w / COLS
 cell_h = page_h / ROWS
 
-count = 0
-for idx, row in df.iterrows():
-    name = str(row.get('Name Shape', '')).strip()
-    WT = row.get('WT', '')
-    HR = row.get('HR', '')
-    WB = row.get('WB', '')
-    HL = row.get('HL', '')
-
-    # تعیین موقعیت در شبکه
-    col_idx = count % COLS
-    row_idx = (count // COLS) % ROWS
-    cell_x = col_idx * cell_w
-    cell_y = page_h - (row_idx + 1) * cell_h
-
-    # عنوان بالای هر سلول
-    c.setFont(TITLE_FONT[0], TITLE_FONT[1])
-    c.drawCentredString(cell_x + cell_w/2, cell_y + cell_h - 0.5*cm, name)
-
-    # پیدا کردن تصویر نمونه برای این مدل
-    tpl = find_template_for_name(name)
-    if tpl is None:
-        tpl = DEFAULT_TEMPLATE if os.path.exists(DEFAULT_TEMPLATE) else None
-
-    if tpl and os.path.exists(tpl):
-        try:
-            img = ImageReader(tpl)
-            img_w_px, img_h_px = img.getSize()
-            # محاسبه اندازه نهایی در واحد points (reportlab) با مقیاس مناسب
-            max_w = (cell_w - 1.0*cm)            # حاشیه افقی داخل سلول
-            max_h = (cell_h - 1.2*cm)            # حاشیه عمودی (برای عنوان هم جا بگذار)
-            scale = min(max_w / img_w_px, max_h / img_h_px, (MAX_IMG_SCALE_CM*cm) / max(img_w_px, img_h_px))
-            if scale <= 0:
-                scale = 1.0
-            draw_w = img_w_px * scale
-            draw_h = img_h_px * scale
-            img_x = cell_x + (cell_w - draw_w) / 2
-            img_y = cell_y + (cell_h - draw_h) / 2 - 0.2*cm
-            c.drawImage(img, img_x, img_y, draw_w, draw_h, preserveAspectRatio=True)
-            # نوشتن ابعاد
-            draw_dimensions_on_cell(c, img_x, img_y, draw_w, draw_h, WT, WB, HR, HL)
-        except Exception as e:
-            # خطای خواندن تصویر
+
+def draw_catalog(c, records, first_row=0):
+    """
+    رسم سلول‌ها به ترتیب؛ first_row شماره ردیف اول records در کل شیت است
+    (for the grid position when the PDF is drawn in shards).
+    """
+    count = first_row
+    for rec in records:  # بدون ساختن Series برای هر ردیف
+        name = rec.name_shape.strip()
+        WT = rec.wt
+        HR = rec.hr
+        WB = rec.wb
+        HL = rec.hl
+
+        # تعیین موقعیت در شبکه
+        col_idx = count % COLS
+        row_idx = (count // COLS) % ROWS
+        cell_x = col_idx * cell_w
+        cell_y = page_h - (row_idx + 1) * cell_h
+
+        # عنوان بالای هر سلول
+        c.setFont(TITLE_FONT[0], TITLE_FONT[1])
+        c.drawCentredString(cell_x + cell_w/2, cell_y + cell_h - 0.5*cm, name)
+
+        # پیدا کردن تصویر نمونه برای این مدل
+        tpl = find_template_for_name(name)
+        if tpl is None:
+            tpl = TEMPLATE_INDEX.exact(os.path.basename(DEFAULT_TEMPLATE))
+
+        if tpl and os.path.exists(tpl):
+            try:
+                img = catalog_image(tpl)  # DXF کنار تصویر به صورت برداری رسم می‌شود
+                img_w_px, img_h_px = img.getSize()
+                # محاسبه اندازه نهایی در واحد points (reportlab) با مقیاس مناسب
+                max_w = (cell_w - 1.0*cm)            # حاشیه افقی داخل سلول
+                max_h = (cell_h - 1.2*cm)            # حاشیه عمودی (برای عنوان هم جا بگذار)
+                scale = min(max_w / img_w_px, max_h / img_h_px, (MAX_IMG_SCALE_CM*cm) / max(img_w_px, img_h_px))
+                if scale <= 0:
+                    scale = 1.0
+                draw_w = img_w_px * scale
+                draw_h = img_h_px * scale
+                img_x = cell_x + (cell_w - draw_w) / 2
+                img_y = cell_y + (cell_h - draw_h) / 2 - 0.2*cm
+                draw_catalog_image(c, img, img_x, img_y, draw_w, draw_h)
+                # نوشتن ابعاد
+                draw_dimensions_on_cell(c, img_x, img_y, draw_w, draw_h, WT, WB, HR, HL)
+            except Exception as e:
+                # خطای خواندن تصویر
+                c.setFont(TEXT_FONT[0], TEXT_FONT[1])
+                c.setFillColorRGB(1, 0, 0)
+                c.drawCentredString(cell_x + cell_w/2, cell_y + cell_h/2, "Image error")
+                c.setFillColorRGB(0, 0, 0)
+        else:
+            # اگر تصویر نمونه وجود نداشت
             c.setFont(TEXT_FONT[0], TEXT_FONT[1])
             c.setFillColorRGB(1, 0, 0)
-            c.drawCentredString(cell_x + cell_w/2, cell_y + cell_h/2, "Image error")
+            c.drawCentredString(cell_x + cell_w/2, cell_y + cell_h/2, "Template not found")
             c.setFillColorRGB(0, 0, 0)
-    else:
-        # اگر تصویر نمونه وجود نداشت
-        c.setFont(TEXT_FONT[0], TEXT_FONT[1])
-        c.setFillColorRGB(1, 0, 0)
-        c.drawCentredString(cell_x + cell_w/2, cell_y + cell_h/2, "Template not found")
-        c.setFillColorRGB(0, 0, 0)
-
-    count += 1
-    if count % IMAGES_PER_PAGE == 0:
+
+        count += 1
+        if count % IMAGES_PER_PAGE == 0:
+            c.showPage()
+
+    # اگر صفحهٔ آخر پر نشده، صفحه را تمام کن
+    if count % IMAGES_PER_PAGE != 0:
         c.showPage()
 
-# اگر صفحهٔ آخر پر نشده، صفحه را تمام کن
-if count % IMAGES_PER_PAGE != 0:
-    c.showPage()
 
-c.save()
-print("Done ->", OUTPUT_PDF)
+def main():
+    # ---------- خواندن اکسل ----------
+    df = pd.read_excel(EXCEL_FILE)
+
+    # ---------- ایجاد PDF ----------
+    # بخش‌های موازی (هر بخش صفحه‌های کامل) و ادغام به ترتیب ردیف‌ها
+    records = iter_records(df, GRID_SPEC, CatalogRecord)
+    build_pdf(OUTPUT_PDF, records, draw_catalog, rows_per_page=IMAGES_PER_PAGE, workers=WORKERS, pagesize=A4)
+    print("Done ->", OUTPUT_PDF)
+
+
+# پردازه‌های کارگر این فایل را import می‌کنند؛ فقط پردازه اصلی PDF را می‌سازد
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@ from PIL import Image, ImageDraw, ImageFont, ImageChops
 import tkinter as tk
 from tkinter import filedialog
 
+from font_registry import load_font
+
 # تابع برای انتخاب پوشه خروجی به صورت پنجره گرافیکی
 def select_output_dir(default_dir="out_images"):
     root = tk.Tk()
@@ -98,17 +100,6 @@ def find_template(shape, subshape=None):
             return os.path.join(TEMPLATES_DIR, fname)
     return None
 
-def load_font(ttf_path, size):
-    try:
-        if ttf_path and os.path.exists(ttf_path):
-            return ImageFont.truetype(ttf_path, size)
-    except Exception:
-        pass
-    try:
-        return ImageFont.load_default()
-    except Exception:
-        return None
-
 def text_size(draw_obj, text, font):
     try:
         bbox = draw_obj.textbbox((0, 0), text, font=font)
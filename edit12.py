@@ -1,7 +1,10 @@
 import os
 import re
 import pandas as pd
-from PIL import Image, ImageDraw, ImageFont, ImageChops
+from PIL import Image, ImageDraw, ImageChops
+
+from pixel_ops import replace_gray_with_white
+from font_registry import load_font
 
 # تنظیمات اولیه
 EXCEL_FILE = "data.xlsx"
@@ -57,18 +60,6 @@ def trim(im, border=5):
     else:
         return im
 
-def replace_gray_with_white(img, threshold=200):
-    # img باید RGBA باشه
-    pixels = img.load()
-    w, h = img.size
-    for x in range(w):
-        for y in range(h):
-            r, g, b, a = pixels[x, y]
-            if a > 0:
-                if abs(r - g) < 10 and abs(g - b) < 10 and r > threshold and g > threshold and b > threshold:
-                    pixels[x, y] = (255, 255, 255, a)
-    return img
-
 def sanitize_filename(s):
     s = str(s).strip()
     s = re.sub(r'[\\/:"*?<>|]+', '', s)
@@ -104,17 +95,6 @@ def find_template(shape, subshape=None):
             return os.path.join(TEMPLATES_DIR, fname)
     return None
 
-def load_font(ttf_path, size):
-    try:
-        if ttf_path and os.path.exists(ttf_path):
-            return ImageFont.truetype(ttf_path, size)
-    except Exception:
-        pass
-    try:
-        return ImageFont.load_default()
-    except Exception:
-        return None
-
 def text_size(draw_obj, text, font):
     try:
         bbox = draw_obj.textbbox((0, 0), text, font=font)
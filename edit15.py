@@ -1,12 +1,18 @@
 import os
 import re
+from collections import namedtuple
 import pandas as pd
-from PIL import Image, ImageDraw, ImageFont, ImageChops
-import tkinter as tk
-from tkinter import filedialog
+from PIL import Image, ImageDraw, ImageChops
+
+from pixel_ops import replace_gray_with_white
+from template_index import TemplateIndex
+from font_registry import load_font
+from section_records import iter_records
+from sheet_cache import load_sheet
 
 EXCEL_FILE = "data.xlsx"
 TEMPLATES_DIR = "templates"
+TEMPLATE_INDEX = TemplateIndex(TEMPLATES_DIR)  # یک بار در شروع برنامه
 
 OUT_W, OUT_H = 1600, 2200
 
@@ -29,6 +35,20 @@ COL_WB = "WB"
 COL_HR = "HR"
 COL_THICK = "Thickness"
 
+# ستون‌هایی که برای هر ردیف خوانده می‌شوند (یک بار برای کل شیت)
+ROW_SPEC = [
+    ("ncode", COL_NCODE, "raw", ""),
+    ("section", COL_SECTION, "raw", ""),
+    ("shape", COL_SHAPE, "raw", ""),
+    ("subshape", COL_SUBSHAPE, "raw", ""),
+    ("WT", COL_WT, "raw", ""),
+    ("H", COL_H, "raw", ""),
+    ("WB", COL_WB, "raw", ""),
+    ("HR", COL_HR, "raw", ""),
+    ("TH", COL_THICK, "raw", ""),
+]
+Row = namedtuple("Row", [f for f, *_ in ROW_SPEC])
+
 COLOR_TEXT = (0, 0, 0)
 COLOR_RECT_BG = (255, 255, 255)
 
@@ -38,6 +58,10 @@ hr_pos = (1000, 1300)
 h_pos  = (200, 1300)
 
 def select_output_dir(default="out_images"):
+    # tkinter فقط برای پنجره انتخاب پوشه؛ render_cli.py بدون آن اجرا می‌شود
+    import tkinter as tk
+    from tkinter import filedialog
+
     root = tk.Tk()
     root.withdraw()
     folder_selected = filedialog.askdirectory(title="Select base output directory")
@@ -63,17 +87,6 @@ def trim(im, border=5):
     else:
         return im
 
-def replace_gray_with_white(img, threshold=200):
-    pixels = img.load()
-    w, h = img.size
-    for x in range(w):
-        for y in range(h):
-            r, g, b, a = pixels[x, y]
-            if a > 0:
-                if abs(r - g) < 10 and abs(g - b) < 10 and r > threshold and g > threshold and b > threshold:
-                    pixels[x, y] = (255, 255, 255, a)
-    return img
-
 def sanitize_filename(s):
     s = str(s).strip()
     s = re.sub(r'[\\/:"*?<>|]+', '', s)
@@ -95,30 +108,25 @@ def find_template(shape, subshape=None):
         candidates.append(f"{s}.{subs}.png")
         candidates.append(f"{s}.{subs}.jpg")
     candidates += [f"{s}.png", f"{s}.jpg"]
-    for c in candidates:
-        path = os.path.join(TEMPLATES_DIR, c)
-        if os.path.exists(path):
-            return path
-    try:
-        files = os.listdir(TEMPLATES_DIR)
-    except FileNotFoundError:
-        return None
-    low_s = s.lower()
-    for fname in files:
-        if fname.lower().startswith(low_s):
-            return os.path.join(TEMPLATES_DIR, fname)
-    return None
-
-def load_font(ttf_path, size):
-    try:
-        if ttf_path and os.path.exists(ttf_path):
-            return ImageFont.truetype(ttf_path, size)
-    except Exception:
-        pass
-    try:
-        return ImageFont.load_default()
-    except Exception:
-        return None
+    return TEMPLATE_INDEX.find(candidates, prefix=s)
+
+# قالب‌های آماده (تمیز، بریده و تغییر اندازه داده شده) برای هر اجرا یک بار ساخته می‌شوند
+_template_cache = {}
+
+def load_template(tpl_path, content_w, content_h):
+    key = (tpl_path, os.path.getmtime(tpl_path), content_w, content_h)
+    tpl_resized = _template_cache.get(key)
+    if tpl_resized is None:
+        tpl = Image.open(tpl_path).convert("RGBA")
+        tpl = replace_gray_with_white(tpl)
+        tpl_cropped = trim(tpl, border=20)
+
+        scale = min(content_w / tpl_cropped.width, content_h / tpl_cropped.height, 1.0)
+        new_w = max(1, int(tpl_cropped.width * scale))
+        new_h = max(1, int(tpl_cropped.height * scale))
+        tpl_resized = tpl_cropped.resize((new_w, new_h), Image.LANCZOS)
+        _template_cache[key] = tpl_resized
+    return tpl_resized
 
 def text_size(draw_obj, text, font):
     try:
@@ -129,36 +137,38 @@ def text_size(draw_obj, text, font):
     except AttributeError:
         return font.getsize(text)
 
-def main():
-    output_dir = select_output_dir()
+def main(output_dir=None, excel_file=EXCEL_FILE, sheet_name=0, header=1, cache_dir=None):
+    # بدون output_dir پنجره انتخاب پوشه باز می‌شود (مثل قبل)
+    if output_dir is None:
+        output_dir = select_output_dir()
+    os.makedirs(output_dir, exist_ok=True)
 
     title_font = load_font(FONT_PATH, TITLE_FONT_SIZE)
     dim_font = load_font(FONT_PATH, DIM_FONT_SIZE)
     thick_font = load_font(FONT_PATH, THICK_FONT_SIZE)
 
-    df = pd.read_excel(EXCEL_FILE, header=1, dtype=str)
+    df = load_sheet(excel_file, sheet_name=sheet_name, header=header, dtype=str, cache_dir=cache_dir)  # از فایل کش ستونی اگر اکسل تغییر نکرده
 
     cols_check = [COL_NCODE, COL_SECTION, COL_SHAPE, COL_SUBSHAPE]
     df_valid = df[~(df[cols_check].isna().all(axis=1) | df[cols_check].apply(lambda row: all(str(x).strip() == '' for x in row), axis=1))]
 
-    for idx, row in df_valid.iterrows():
-        ncode = row.get(COL_NCODE, "").strip()
-        section = row.get(COL_SECTION, "").strip()
-        shape = row.get(COL_SHAPE, "")
-        subshape = row.get(COL_SUBSHAPE, "")
-        WT = row.get(COL_WT, "")
-        H = row.get(COL_H, "")
-        WB = row.get(COL_WB, "")
-        HR = row.get(COL_HR, "")
-        TH = row.get(COL_THICK, "")
+    for idx, rec in zip(df_valid.index, iter_records(df_valid, ROW_SPEC, Row)):
+        ncode = rec.ncode.strip()
+        section = rec.section.strip()
+        shape = rec.shape
+        subshape = rec.subshape
+        WT = rec.WT
+        H = rec.H
+        WB = rec.WB
+        HR = rec.HR
+        TH = rec.TH
 
         base_name = sanitize_filename(f"{ncode} _ {section}")
         out_path = os.path.join(output_dir, f"{base_name}.png")
 
         tpl_path = find_template(shape, subshape)
         if tpl_path is None:
-            default_tpl = os.path.join(TEMPLATES_DIR, "default.png")
-            tpl_path = default_tpl if os.path.exists(default_tpl) else None
+            tpl_path = TEMPLATE_INDEX.exact("default.png")
 
         canvas_img = Image.new("RGB", (OUT_W, OUT_H), color=(255, 255, 255))
         draw = ImageDraw.Draw(canvas_img)
@@ -176,14 +186,8 @@ def main():
 
         if tpl_path:
             try:
-                tpl = Image.open(tpl_path).convert("RGBA")
-                tpl = replace_gray_with_white(tpl)
-                tpl_cropped = trim(tpl, border=20)
-
-                scale = min(content_w / tpl_cropped.width, content_h / tpl_cropped.height, 1.0)
-                new_w = max(1, int(tpl_cropped.width * scale))
-                new_h = max(1, int(tpl_cropped.height * scale))
-                tpl_resized = tpl_cropped.resize((new_w, new_h), Image.LANCZOS)
+                tpl_resized = load_template(tpl_path, content_w, content_h)
+                new_w, new_h = tpl_resized.size
 
                 img_x = (OUT_W - new_w) // 2
                 img_y = content_top + (content_h - new_h) // 2
@@ -3,6 +3,8 @@ import re
 import pandas as pd
 from PIL import Image, ImageDraw, ImageFont
 
+from font_registry import load_font
+
 # =============== تنظیمات ===============
 EXCEL_FILE = "data.xlsx"
 TEMPLATES_DIR = "templates"
@@ -69,17 +71,6 @@ def find_template(shape, subshape=None):
             return os.path.join(TEMPLATES_DIR, fname)
     return None
 
-def load_font(ttf_path, size):
-    try:
-        if ttf_path and os.path.exists(ttf_path):
-            return ImageFont.truetype(ttf_path, size)
-    except Exception:
-        pass
-    try:
-        return ImageFont.load_default()
-    except Exception:
-        return None
-
 def text_size(draw_obj, text, font):
     try:
         bbox = draw_obj.textbbox((0, 0), text, font=font)
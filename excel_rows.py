@@ -0,0 +1,91 @@
+## ========================================================================================================
+## SUMMARY / خلاصه
+##
+## Streaming row reader for the Excel databases. pd.read_excel(..., header=1) loads the whole
+## workbook before the first row can be used; for 100k-row section catalogs that means a long
+## startup and a high memory peak. iter_rows() walks the sheet with openpyxl's read-only
+## iterator and yields one dict per row, so rendering can start with the first row and
+## memory stays flat.
+##
+## Same semantics as pd.read_excel(path, header=N):
+## - row N (0-based) holds the column names; rows above it are skipped
+## - unnamed columns become "Unnamed: i", repeated names get ".1", ".2", ...
+## - the sheet is as wide as its last non-empty cell: trailing columns that are empty in every
+##   row are dropped. openpyxl pads rows to the stored sheet dimension, which often includes
+##   formatted but empty columns (database.xlsx: 80 instead of 77), so when that dimension is
+##   wider than the header row one quick extra pass finds the real width (_data_width)
+## - empty cells are NaN; with dtype=str every other cell is turned into a string
+## - completely empty rows are skipped (the scripts drop them with dropna anyway)
+##
+## With row_numbers=True every row comes with its worksheet row number (the number Excel shows
+## on the left), so messages about a bad cell point at the right row even after empty rows.
+## ========================================================================================================
+
+import math
+
+from openpyxl import load_workbook
+
+NAN = float("nan")
+
+
+def isna(value):
+    """True for an empty cell (None or NaN), like pd.isna for scalars."""
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _column_names(header_row):
+    names, seen = [], {}
+    for i, name in enumerate(header_row):
+        name = f"Unnamed: {i}" if name is None else name
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _data_width(ws):
+    """Number of columns up to the last non-empty cell of any row, as pandas counts them."""
+    width = 0
+    for values in ws.iter_rows(values_only=True):
+        for i in range(len(values) - 1, width - 1, -1):
+            if values[i] is not None:
+                width = i + 1
+                break
+    return width
+
+
+def iter_rows(path, sheet_name=0, header=0, dtype=None, row_numbers=False):
+    """Yield {column: value} dicts for every data row of the sheet, one at a time,
+    or (worksheet row number, dict) pairs with row_numbers=True."""
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[sheet_name] if isinstance(sheet_name, int) else wb[sheet_name]
+        rows = ws.iter_rows(values_only=True)
+        for _ in range(header):
+            next(rows, None)
+        header_row = next(rows, ())
+        width = len(header_row)
+        while width and header_row[width - 1] is None:
+            width -= 1
+        if ws.max_column is None or ws.max_column > width:  ## Padded to the dimension / ستون‌های خالی انتها
+            width = _data_width(ws)
+        columns = _column_names((header_row + (None,) * width)[:width])
+
+        ## openpyxl starts at row 1 and fills in missing rows / شماره ردیف در اکسل
+        for excel_row, values in enumerate(rows, header + 2):
+            if all(v is None for v in values):
+                continue
+            record = {}
+            for i, name in enumerate(columns):
+                v = values[i] if i < len(values) else None
+                if v is None:
+                    v = NAN
+                elif dtype is str:
+                    v = str(v)
+                record[name] = v
+            yield (excel_row, record) if row_numbers else record
+    finally:
+        wb.close()  ## Read-only workbooks keep the file open until closed / فایل را ببند
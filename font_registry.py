@@ -0,0 +1,56 @@
+## ========================================================================================================
+## SUMMARY / خلاصه
+##
+## Shared font registry for the PIL-based scripts (edit2 .. edit.16, "edit 11.py").
+## load_font(path, size) used to re-parse the TrueType file from disk on every call, and
+## draw_dims calls it for every Thickness label on every row. Fonts are now loaded once
+## per (path, size) and the same ImageFont object is handed out afterwards. PIL fonts are
+## read-only once loaded, so sharing them between rows is safe.
+##
+## Run this file directly for a benchmark on a 5,000-row sheet:
+##     python font_registry.py [path/to/font.ttf]
+## ========================================================================================================
+
+import os
+import sys
+import time
+from functools import lru_cache
+
+from PIL import ImageFont
+
+
+def _load_font_uncached(ttf_path, size):
+    try:
+        if ttf_path and os.path.exists(ttf_path):
+            return ImageFont.truetype(ttf_path, size)
+    except Exception:
+        pass
+    try:
+        return ImageFont.load_default()
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=None)
+def load_font(ttf_path, size):
+    """Return the font for (ttf_path, size), falling back to PIL's default font like before."""
+    return _load_font_uncached(ttf_path, size)
+
+
+if __name__ == "__main__":
+    ## ---------- Benchmark: one Thickness label font per row / بنچمارک: یک فونت برای هر ردیف ----------
+    font_path = sys.argv[1] if len(sys.argv) > 1 else r"C:\Windows\Fonts\arial.ttf"
+    rows = 5000
+    if not os.path.exists(font_path):
+        print(f"Font not found: {font_path} (timing PIL's default font instead)")
+
+    t0 = time.perf_counter()
+    for _ in range(rows):
+        _load_font_uncached(font_path, 100)
+    t1 = time.perf_counter()
+    for _ in range(rows):
+        load_font(font_path, 100)
+    t2 = time.perf_counter()
+
+    print(f"{rows} rows: uncached {t1 - t0:.3f}s ({(t1 - t0) / rows * 1e3:.3f} ms/row), "
+          f"registry {t2 - t1:.3f}s ({(t2 - t1) / rows * 1e3:.4f} ms/row)")
@@ -0,0 +1,95 @@
+## ========================================================================================================
+## SUMMARY / خلاصه
+##
+## Label layout table. The H/WB/HR/TH/WT/Subshape/Section Name coordinate formulas of
+## "e26 with comment.py" and "final e28 ..." used to run one row at a time inside the render
+## loop. compute_layout() evaluates them for all rows in one columnar NumPy pass, including the
+## thin-wall step beam rule for Subshape_y, and returns a DataFrame with one row per input row:
+##     H_x, H_y, WB_x, WB_y, HR_x, HR_y, TH_x, TH_y, WT_x, WT_y, Subshape_x, Subshape_y,
+##     SectionName_x, SectionName_y
+## The render workers only read these coordinates. The table can also be exported with
+## export_layout() and diffed or cached on its own; both go through layout_for_styled_jobs(),
+## so every row gets the Subshape offsets of its own job["layout"] (e28/e26/e24).
+##
+## All coordinates are relative to the XL/YB shifted origin of the DXF.
+## ========================================================================================================
+
+import numpy as np
+import pandas as pd
+
+## ---------- Label layout parameters / پارامترهای چیدمان متن‌ها ----------
+LABEL_GAP = 2                 ## Labels sit LABEL_GAP * TH away from the walls / فاصله متن از دیواره
+SUBSHAPE_OFFSET = 0.3         ## Subshape label above the Th label / فاصله Subshape از Th
+SUBSHAPE_OFFSET_THIN = 0.6    ## Same, for thin-wall step beams / برای استپ‌بیم با ضخامت کم
+THIN_WALL = 0.08              ## Step beams thinner than this use SUBSHAPE_OFFSET_THIN
+SECTION_NAME_OFFSET = 0.4     ## Section Name above half height / فاصله نام مقطع
+
+LABELS = ["H", "WB", "HR", "TH", "WT", "Subshape", "SectionName"]
+LAYOUT_COLUMNS = [f"{label}_{axis}" for label in LABELS for axis in "xy"]
+
+
+def compute_layout(shape, WT, H, WB, HR, TH, XL, YB,
+                   subshape_offset=SUBSHAPE_OFFSET, subshape_offset_thin=SUBSHAPE_OFFSET_THIN):
+    """Label coordinates for every row at once. All arguments are equal-length columns."""
+    WT, H, WB, HR, TH, XL, YB = (np.asarray(v, dtype=np.float64) for v in (WT, H, WB, HR, TH, XL, YB))
+    zeros = np.zeros_like(TH)
+
+    TH_y = -YB + (HR / 2)
+    ## Thin-wall step beams need more room above the Th label / استپ‌بیم با ضخامت کم
+    is_step = pd.Series(shape, dtype=object).astype(str).str.lower().str.startswith("step").to_numpy()
+    thin = is_step & (TH < THIN_WALL)
+
+    return pd.DataFrame({
+        "H_x": -XL - (LABEL_GAP * TH),
+        "H_y": (H / 2) - YB,
+        "WB_x": -XL + (WB / 2),
+        "WB_y": -YB - (LABEL_GAP * TH),
+        "HR_x": (-XL + WB) + (LABEL_GAP * TH),
+        "HR_y": -YB + (HR / 2),
+        "TH_x": zeros,
+        "TH_y": TH_y,
+        "WT_x": -XL + (WT / 2),
+        "WT_y": (H - YB) + (LABEL_GAP * TH),
+        "Subshape_x": zeros,
+        "Subshape_y": TH_y + np.where(thin, subshape_offset_thin, subshape_offset),
+        "SectionName_x": -XL + (WT / 2),
+        "SectionName_y": (H / 2) + SECTION_NAME_OFFSET,
+    }, columns=LAYOUT_COLUMNS)
+
+
+def layout_for_jobs(jobs, **offsets):
+    """Layout table for a list of batch_render jobs, in the same order; offsets go to compute_layout."""
+    return compute_layout(
+        [job["shape"] for job in jobs],
+        *([job[k] for job in jobs] for k in ("WT", "H", "WB", "HR", "TH", "XL", "YB")),
+        **offsets,
+    )
+
+
+def layout_for_styled_jobs(jobs, layouts):
+    """Layout table for jobs in the same order, each with the Subshape offsets of
+    layouts[job["layout"]] (batch_render.LAYOUTS)."""
+    parts = []
+    for name in dict.fromkeys(job["layout"] for job in jobs):  ## One pass per layout / هر سبک یک بار
+        idx = [i for i, job in enumerate(jobs) if job["layout"] == name]
+        style = layouts[name]
+        part = layout_for_jobs([jobs[i] for i in idx], subshape_offset=style["subshape_offset"],
+                               subshape_offset_thin=style["subshape_offset_thin"])
+        part.index = idx
+        parts.append(part)
+    if not parts:
+        return layout_for_jobs([])
+    return pd.concat(parts).sort_index()
+
+
+def positions(layout_row):
+    """{label: (x, y)} from one row of the layout table (a tuple in LAYOUT_COLUMNS order)."""
+    return {label: (float(layout_row[2 * i]), float(layout_row[2 * i + 1])) for i, label in enumerate(LABELS)}
+
+
+def export_layout(jobs, path, layouts):
+    """Write the layout table of `jobs` as CSV, with the output path as the first column."""
+    layout = layout_for_styled_jobs(jobs, layouts)
+    layout.insert(0, "out_path", [job["out_path"] for job in jobs])
+    layout.to_csv(path, index=False, float_format="%.6f")
+    return layout
@@ -1,67 +1,86 @@
 import pandas as pd
 from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
 from reportlab.lib.units import cm
-from reportlab.lib.utils import ImageReader
 import os
 
+from pdf_shards import build_pdf
+from section_records import CATALOG_SPEC, CatalogRecord, iter_records
+from vector_catalog import catalog_image, draw_catalog_image
+
 # Excel file name /نام فایل اکسل
 excel_file = "data.xlsx"  # always you should put name of excel file you need to change/اینجا اسم فایل اکسل رو بگذار
 
-# Read data from Excel / خواندن داده‌ها از اکسل
-df = pd.read_excel(excel_file)
-
 # Output name file / نام فایل خروجی PDF
 output_pdf = "output.pdf"
 
-# Create PDF/ایجاد PDF
-c = canvas.Canvas(output_pdf, pagesize=A4)
+# Processes drawing the PDF in shards (1 = single canvas) / تعداد پردازه‌ها برای ساخت PDF
+workers = os.cpu_count()
+
 page_width, page_height = A4
 
-for index, row in df.iterrows():
-    name_shape = str(row['Name Shape'])
-    WT = row['WT']
-    HR = row['HR']
-    WB = row['WB']
-    HL = row['HL']
-    img_path = row.iloc[5]  # column F / ستون F
-
-    # Title / عنوان بالای صفحه
-    c.setFont("Helvetica-Bold", 16)
-    c.drawCentredString(page_width / 2, page_height - 2 * cm, name_shape)
-
-    # Add image / اضافه کردن تصویر
-    if os.path.exists(img_path):
-        img = ImageReader(img_path)
-        img_width, img_height = img.getSize()
-        max_width = 10 * cm
-        max_height = 10 * cm
-
-        scale = min(max_width / img_width, max_height / img_height)
-        img_width *= scale
-        img_height *= scale
-
-        img_x = (page_width - img_width) / 2
-        img_y = (page_height - img_height) / 2
-        c.drawImage(img, img_x, img_y, img_width, img_height)
-
-        # Write the size / نوشتن اندازه‌ها
-        c.setFont("Helvetica", 12)
-        # Top / بالا (WT)
-        c.drawCentredString(page_width / 2, img_y + img_height + 0.5 * cm, f"WT: {WT}")
-        # Bottom / پایین (WB)
-        c.drawCentredString(page_width / 2, img_y - 1 * cm, f"WB: {WB}")
-        # Right / راست (HR)
-        c.drawString(img_x + img_width + 0.5 * cm, img_y + img_height / 2, f"HR: {HR}")
-        # Left / چپ  (HL)
-        c.drawRightString(img_x - 0.5 * cm, img_y + img_height / 2, f"HL: {HL}")
-
-    else:
-        c.setFont("Helvetica", 12)
-        c.setFillColorRGB(1, 0, 0)
-        c.drawCentredString(page_width / 2, page_height / 2, "Image not found")
-
-    c.showPage()
-
-c.save()
-print(f"PDF Done : {output_pdf}")
+
+def draw_catalog(c, records, first_row=0):
+    """One page per record; first_row (the row index of records[0]) is not needed for one page per row."""
+    for rec in records:
+        name_shape = rec.name_shape
+        WT = rec.wt
+        HR = rec.hr
+        WB = rec.wb
+        HL = rec.hl
+        img_path = rec.img_path  # column F / ستون F
+
+        # Title / عنوان بالای صفحه
+        c.setFont("Helvetica-Bold", 16)
+        c.drawCentredString(page_width / 2, page_height - 2 * cm, name_shape)
+
+        # Add image / اضافه کردن تصویر
+        # Vector DXF geometry when a .dxf sits next to the PNG / اگر DXF کنار PNG باشد، برداری رسم می‌شود
+        if os.path.exists(img_path):
+            img = catalog_image(img_path)
+            img_width, img_height = img.getSize()
+            max_width = 10 * cm
+            max_height = 10 * cm
+
+            scale = min(max_width / img_width, max_height / img_height)
+            img_width *= scale
+            img_height *= scale
+
+            img_x = (page_width - img_width) / 2
+            img_y = (page_height - img_height) / 2
+            draw_catalog_image(c, img, img_x, img_y, img_width, img_height)
+
+            # Write the size / نوشتن اندازه‌ها
+            c.setFont("Helvetica", 12)
+            # Top / بالا (WT)
+            c.drawCentredString(page_width / 2, img_y + img_height + 0.5 * cm, f"WT: {WT}")
+            # Bottom / پایین (WB)
+            c.drawCentredString(page_width / 2, img_y - 1 * cm, f"WB: {WB}")
+            # Right / راست (HR)
+            c.drawString(img_x + img_width + 0.5 * cm, img_y + img_height / 2, f"HR: {HR}")
+            # Left / چپ  (HL)
+            c.drawRightString(img_x - 0.5 * cm, img_y + img_height / 2, f"HL: {HL}")
+
+        else:
+            c.setFont("Helvetica", 12)
+            c.setFillColorRGB(1, 0, 0)
+            c.drawCentredString(page_width / 2, page_height / 2, "Image not found")
+
+        c.showPage()
+
+
+def main():
+    # Read data from Excel / خواندن داده‌ها از اکسل
+    df = pd.read_excel(excel_file)
+
+    # Columns are decoded once for the whole sheet / ستون‌ها یک بار برای کل شیت خوانده می‌شوند
+    records = iter_records(df, CATALOG_SPEC, CatalogRecord)
+
+    # Create PDF, in parallel shards merged in row order / ساخت PDF به صورت موازی و ادغام به ترتیب ردیف‌ها
+    build_pdf(output_pdf, records, draw_catalog, rows_per_page=1, workers=workers, pagesize=A4)
+    print(f"PDF Done : {output_pdf}")
+
+
+# Worker processes import this file, so only the main process builds the PDF
+# پردازه‌های کارگر این فایل را import می‌کنند؛ فقط پردازه اصلی PDF را می‌سازد
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+## ========================================================================================================
+## SUMMARY / خلاصه
+##
+## Sharded PDF builder for the reportlab catalogs (main.py, edit.py). A single canvas draws
+## every page on one core. build_pdf() splits the rows into shards of whole pages, draws
+## each shard into its own part PDF in a worker process, then concatenates the parts in row
+## order with pypdf. Bookmarks (outline entries), if the drawing function adds any, come
+## along with their pages, and every shard is told the index of its first row so grid
+## positions stay global.
+##
+## The catalog script provides the drawing function:
+##     def draw_catalog(c, records, first_row):    # draws records, first_row = index of records[0]
+## It must be a module-level function so worker processes can import it.
+##
+## STREAMING / حافظه ثابت:
+## reportlab keeps every page of a canvas in memory until c.save(), and pypdf's PdfWriter
+## keeps every merged page until write(). Both grow with the number of rows. Here a canvas
+## never holds more than one shard, and PdfStream copies each part into the output file page
+## by page, keeping only the file offsets and page ids (a few bytes per page). With
+## stream=True (the default) this is also used when drawing on one core, so memory stays
+## flat however many rows the sheet has. Only top-level bookmarks are carried over (the
+## catalogs write none).
+##
+## SHARED RESOURCES / منابع مشترک:
+## Every part is its own reportlab document, so each one embeds its own copy of the fonts
+## and of the image forms (user-021 embeds each bitmap once per canvas, not once per PDF).
+## PdfStream writes an object reached from a page's /Resources only once: it is copied with
+## its references already renumbered, and one with the same bytes from an earlier part is
+## reused. The merged file is then about the size of a single-canvas one. The cost is one
+## sha256 digest kept per distinct resource object (fonts, forms, images), not per page;
+## page content streams are written without hashing. Run this file directly for the memory benchmark:
+##     python pdf_shards.py 20000
+##
+## pypdf is optional: without it (or with stream=False and workers=1, or a small sheet) the
+## catalog is drawn on one canvas exactly as before.
+##
+## USAGE / استفاده:
+##     build_pdf("output.pdf", records, draw_catalog, rows_per_page=1, workers=os.cpu_count())
+## ========================================================================================================
+
+import hashlib
+import io
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+try:
+    from pypdf import PdfReader
+    from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, NameObject, StreamObject
+except ImportError:  ## Merging needs pypdf; without it everything is drawn serially / بدون pypdf سریال
+    PdfReader = None
+
+SHARD_ROWS = 500  ## Rows per shard (rounded up to whole pages) / تعداد ردیف در هر بخش
+
+
+def part_path(out_path, index):
+    base, ext = os.path.splitext(out_path)
+    return f"{base}.part{index:04d}{ext}"
+
+
+def render_shard(draw, records, first_row, path, pagesize=A4):
+    """Worker: draw `records` on a fresh canvas and save it as `path`. Returns the path."""
+    c = canvas.Canvas(path, pagesize=pagesize)
+    draw(c, records, first_row)
+    c.save()
+    return path
+
+
+## ---------- Page-by-page merge / ادغام صفحه به صفحه ----------
+_INHERITED = ("/Resources", "/MediaBox", "/CropBox", "/Rotate")
+_PAGES_ID, _CATALOG_ID, _OUTLINES_ID = 1, 2, 3  ## Written last / در پایان نوشته می‌شوند
+
+
+class PdfStream:
+    """
+    Write the pages of several PDFs into one file as they are read. Objects go to disk at once;
+    only their offsets, the page ids, the last bookmark and the digests of the shared
+    resources stay in memory.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._f = open(path, "wb")
+        self._f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._offsets = array("q", [0, 0, 0, 0])  ## Object id -> file offset (id 0 unused) / آفست هر شیء
+        self._pages = array("q")
+        self._outline_count = 0
+        self._first_item = None
+        self._pending_item = None  ## (id, prev_id, title, dest); written once its /Next is known
+        self._shared = {}  ## sha256 of a written resource object -> its id / منابع تکراری یک بار
+        self._active = set()
+
+    def _new_id(self):
+        self._offsets.append(0)
+        return len(self._offsets) - 1
+
+    def _write(self, obj_id, obj):
+        self._offsets[obj_id] = self._f.tell()
+        self._f.write(b"%d 0 obj\n" % obj_id)
+        obj.write_to_stream(self._f)
+        self._f.write(b"\nendobj\n")
+
+    def _write_bytes(self, obj_id, data):
+        self._offsets[obj_id] = self._f.tell()
+        self._f.write(b"%d 0 obj\n%s\nendobj\n" % (obj_id, data))
+
+    def _copy(self, obj, reader, remap, shared=False):
+        """obj with its references renumbered; referenced objects are written first (see _emit)."""
+        if isinstance(obj, IndirectObject):
+            return IndirectObject(self._emit(obj.idnum, reader, remap, shared), 0, None)
+        if isinstance(obj, DictionaryObject):
+            new = obj.__class__()
+            if isinstance(obj, StreamObject):
+                new._data = obj._data  ## Still compressed, written as is / بدون باز کردن فشرده‌سازی
+            for key, value in obj.items():
+                new[key] = self._copy(value, reader, remap, shared or key == "/Resources")
+            return new
+        if isinstance(obj, ArrayObject):
+            return ArrayObject(self._copy(v, reader, remap, shared) for v in obj)
+        return obj
+
+    def _emit(self, old, reader, remap, shared):
+        """New id of object `old` of the part; shared (resource) objects are written once per content."""
+        if old in remap:
+            return remap[old]
+        if old in self._active:  ## Reference cycle: the outer copy writes it / حلقه ارجاع
+            remap[old] = self._new_id()
+            return remap[old]
+        if not shared:  ## Page contents: a fresh id, no digest / محتوای صفحه بدون هش
+            remap[old] = self._new_id()
+            self._write(remap[old], self._copy(reader.get_object(old), reader, remap))
+            return remap[old]
+
+        self._active.add(old)
+        new = self._copy(reader.get_object(old), reader, remap, shared)  ## Children first / اول فرزندان
+        self._active.discard(old)
+        if old in remap:  ## Given an id by a cycle while it was copied / در حلقه شناسه گرفته
+            self._write(remap[old], new)
+            return remap[old]
+        buf = io.BytesIO()
+        new.write_to_stream(buf)
+        key = hashlib.sha256(buf.getvalue()).digest()
+        if key not in self._shared:
+            self._shared[key] = self._new_id()
+            self._write_bytes(self._shared[key], buf.getvalue())
+        remap[old] = self._shared[key]
+        return remap[old]
+
+    def add_part(self, path):
+        """Append every page and top-level bookmark of the PDF at `path`."""
+        reader = PdfReader(path)
+        remap = {}  ## Per part: old id -> new id / فقط برای همین بخش
+        for page in reader.pages:
+            page_id = remap[page.indirect_reference.idnum] = self._new_id()
+            ## Contents, fonts, forms of this page are written before it / محتوا، فونت‌ها و فرم‌ها
+            new = self._copy(DictionaryObject((k, v) for k, v in page.items() if k != "/Parent"), reader, remap)
+            for key in _INHERITED:
+                if key not in new:
+                    value = self._inherited(page, key)
+                    if value is not None:
+                        new[NameObject(key)] = self._copy(value, reader, remap, key == "/Resources")
+            new[NameObject("/Parent")] = IndirectObject(_PAGES_ID, 0, None)
+            self._write(page_id, new)
+            self._pages.append(page_id)
+
+        outlines = reader.trailer["/Root"].get("/Outlines")
+        item = outlines.get_object().get("/First") if outlines is not None else None
+        while item is not None:
+            item = item.get_object()
+            dest = item.get("/Dest")
+            if dest is not None and not isinstance(dest, ArrayObject):
+                dest = None  ## Named destinations are not carried over / مقصد نام‌دار پشتیبانی نمی‌شود
+            if dest is not None and dest[0].idnum in remap:
+                self._add_bookmark(item["/Title"], self._copy(dest, reader, remap))
+            item = item.get("/Next")
+
+    @staticmethod
+    def _inherited(page, key):
+        node = page
+        while node is not None:
+            if key in node:
+                return node[key]
+            node = node.get("/Parent")
+            node = node.get_object() if node is not None else None
+        return None
+
+    def _add_bookmark(self, title, dest):
+        item_id = self._new_id()
+        self._outline_count += 1
+        if self._pending_item is None:
+            self._first_item = item_id
+            prev_id = None
+        else:
+            prev_id = self._pending_item[0]
+            self._write_bookmark(*self._pending_item, next_id=item_id)
+        self._pending_item = (item_id, prev_id, title, dest)
+
+    def _write_bookmark(self, item_id, prev_id, title, dest, next_id=None):
+        item = DictionaryObject({NameObject("/Title"): title, NameObject("/Dest"): dest,
+                                 NameObject("/Parent"): IndirectObject(_OUTLINES_ID, 0, None)})
+        if prev_id is not None:
+            item[NameObject("/Prev")] = IndirectObject(prev_id, 0, None)
+        if next_id is not None:
+            item[NameObject("/Next")] = IndirectObject(next_id, 0, None)
+        self._write(item_id, item)
+
+    def close(self):
+        """Write the page tree, bookmarks, catalog, xref table and trailer."""
+        f = self._f
+        self._offsets[_PAGES_ID] = f.tell()
+        f.write(b"%d 0 obj\n<< /Type /Pages /Count %d /Kids [" % (_PAGES_ID, len(self._pages)))
+        for i, page_id in enumerate(self._pages):
+            f.write(b"%s%d 0 R" % (b"\n" if i % 10 == 0 else b" ", page_id))
+        f.write(b" ] >>\nendobj\n")
+
+        catalog = b"<< /Type /Catalog /Pages %d 0 R" % _PAGES_ID
+        if self._pending_item is not None:
+            self._write_bookmark(*self._pending_item)
+            self._offsets[_OUTLINES_ID] = f.tell()
+            f.write(b"%d 0 obj\n<< /Type /Outlines /First %d 0 R /Last %d 0 R /Count %d >>\nendobj\n"
+                    % (_OUTLINES_ID, self._first_item, self._pending_item[0], self._outline_count))
+            catalog += b" /Outlines %d 0 R /PageMode /UseOutlines" % _OUTLINES_ID
+        else:
+            self._offsets[_OUTLINES_ID] = f.tell()
+            f.write(b"%d 0 obj\nnull\nendobj\n" % _OUTLINES_ID)
+        self._offsets[_CATALOG_ID] = f.tell()
+        f.write(b"%d 0 obj\n%s >>\nendobj\n" % (_CATALOG_ID, catalog))
+
+        xref = f.tell()
+        f.write(b"xref\n0 %d\n0000000000 65535 f \n" % len(self._offsets))
+        for offset in islice(self._offsets, 1, None):
+            f.write(b"%010d 00000 n \n" % offset)
+        f.write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+                % (len(self._offsets), _CATALOG_ID, xref))
+        f.close()
+
+
+def merge_parts(parts, out_path):
+    """Concatenate the part PDFs in order into out_path, keeping their bookmarks."""
+    tmp = out_path + ".tmp"
+    stream = PdfStream(tmp)
+    try:
+        for part in parts:
+            stream.add_part(part)
+    finally:
+        stream.close()
+    os.replace(tmp, out_path)
+
+
+def _chunks(records, size):
+    it = iter(records)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def build_pdf(out_path, records, draw, rows_per_page=1, workers=None, shard_rows=SHARD_ROWS, pagesize=A4,
+              stream=True):
+    """
+    Draw `records` with draw(c, records, first_row) into out_path.
+    With more than one shard, pypdf installed and workers > 1, shards are drawn in parallel
+    and merged. Otherwise, with stream=True, shards are drawn one after the other and streamed
+    into out_path (records may be an iterator, it is read one shard at a time); with
+    stream=False one canvas is used. Returns the number of shards.
+    """
+    workers = workers or os.cpu_count() or 1
+    ## Shards hold whole pages so no page is split between two parts / هر بخش شامل صفحه‌های کامل
+    shard_rows = -(-shard_rows // rows_per_page) * rows_per_page
+
+    if PdfReader is not None and workers > 1:
+        records = list(records)
+        starts = list(range(0, len(records), shard_rows))
+        if len(starts) > 1:
+            return _build_parallel(out_path, records, draw, starts, shard_rows, workers, pagesize)
+
+    if PdfReader is None or not stream:
+        if PdfReader is None:
+            print("pypdf is not installed: drawing the PDF on a single canvas.")
+        render_shard(draw, list(records), 0, out_path, pagesize)
+        return 1
+
+    ## ---------- Serial streaming: one shard in memory at a time / فقط یک بخش در حافظه ----------
+    parts, first_row = [], 0
+    try:
+        for chunk in _chunks(records, shard_rows):
+            parts.append(render_shard(draw, chunk, first_row, part_path(out_path, len(parts)), pagesize))
+            first_row += len(chunk)
+        if len(parts) == 1:
+            os.replace(parts[0], out_path)
+        elif parts:
+            merge_parts(parts, out_path)
+        else:
+            render_shard(draw, [], 0, out_path, pagesize)  ## Empty sheet / شیت خالی
+    finally:
+        _remove(parts)
+    return max(len(parts), 1)
+
+
+def _build_parallel(out_path, records, draw, starts, shard_rows, workers, pagesize):
+    parts = [part_path(out_path, i) for i in range(len(starts))]
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(starts))) as pool:
+            futures = [pool.submit(render_shard, draw, records[s:s + shard_rows], s, path, pagesize)
+                       for s, path in zip(starts, parts)]
+            for f in futures:
+                f.result()  ## Re-raise the first worker error / نمایش خطای پردازه
+        merge_parts(parts, out_path)
+    finally:
+        _remove(parts)
+    return len(parts)
+
+
+def _remove(paths):
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    ## ---------- Benchmark: peak memory of one canvas vs streamed shards / مقایسه حافظه ----------
+    import sys
+    import tempfile
+    import time
+    import tracemalloc
+
+    import main as catalog
+    from section_records import CatalogRecord
+
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    names = sorted(os.path.splitext(f)[0] for f in os.listdir("templates") if f.lower().endswith(".png"))
+    out_dir = tempfile.mkdtemp()
+
+    def records(n):
+        ## Lazy, like iter_records(): the sheet is never copied into a list here / بدون ساختن لیست
+        return (CatalogRecord(names[i % len(names)], 1.5, 2.0, 1.5, 2.0,
+                              os.path.join("templates", names[i % len(names)] + ".png")) for i in range(n))
+
+    for n in (rows // 4, rows):
+        for label, stream in (("one canvas", False), ("streamed", True)):
+            out = os.path.join(out_dir, f"{label}-{n}.pdf")
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            build_pdf(out, records(n), catalog.draw_catalog, workers=1, stream=stream)
+            seconds = time.perf_counter() - t0
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{label:10s} {n:6d} rows: peak {peak / 2**20:6.1f} MB, {seconds:6.1f}s, "
+                  f"{os.path.getsize(out) / 2**20:.1f} MB file")
@@ -0,0 +1,113 @@
+## ========================================================================================================
+## SUMMARY / خلاصه
+##
+## Array versions of the per-pixel colour clean-ups used by the PIL scripts:
+## - replace_gray_with_white: light gray pixels -> white (edit12..edit.16, e17)
+## - replace_blue_with_black: blue pixels -> black ("test simple dxf.py")
+## The masks are computed on the whole RGBA buffer at once with NumPy instead of one
+## pixels[x, y] lookup per pixel. Both functions change the image in place and return it,
+## like the loops they replace.
+##
+## Run this file directly to check that the results match the old loops and to time both:
+##     python pixel_ops.py
+## ========================================================================================================
+
+import time
+
+import numpy as np
+from PIL import Image
+
+
+def replace_gray_with_white(img, threshold=200, alpha=None):
+    """
+    Turn light gray pixels (r, g, b within 10 of each other and all above `threshold`) white.
+    The pixel keeps its alpha, unless `alpha` is given (e17 uses alpha=0 to make them transparent).
+    `img` must be RGBA.
+    """
+    arr = np.array(img)
+    rgb = arr[..., :3].astype(np.int16)  ## int16 so r - g cannot wrap around / جلوگیری از سرریز
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    mask = (
+        (arr[..., 3] > 0)
+        & (np.abs(r - g) < 10) & (np.abs(g - b) < 10)
+        & (r > threshold) & (g > threshold) & (b > threshold)
+    )
+    arr[mask, :3] = 255
+    if alpha is not None:
+        arr[mask, 3] = alpha
+    img.paste(Image.fromarray(arr, "RGBA"))
+    return img
+
+
+def replace_blue_with_black(img):
+    """Turn clearly blue pixels (b > 100 and 20 above r and g) black, keeping alpha. `img` must be RGBA."""
+    arr = np.array(img)
+    rgb = arr[..., :3].astype(np.int16)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    mask = (arr[..., 3] > 0) & (b > 100) & (b > r + 20) & (b > g + 20)
+    arr[mask, :3] = 0
+    img.paste(Image.fromarray(arr, "RGBA"))
+    return img
+
+
+## ---------- Reference loops (previous implementation) / پیاده‌سازی قبلی برای مقایسه ----------
+def _replace_gray_with_white_loop(img, threshold=200, alpha=None):
+    pixels = img.load()
+    w, h = img.size
+    for x in range(w):
+        for y in range(h):
+            r, g, b, a = pixels[x, y]
+            if a > 0:
+                if abs(r - g) < 10 and abs(g - b) < 10 and r > threshold and g > threshold and b > threshold:
+                    pixels[x, y] = (255, 255, 255, a if alpha is None else alpha)
+    return img
+
+
+def _replace_blue_with_black_loop(img):
+    pixels = img.load()
+    w, h = img.size
+    for x in range(w):
+        for y in range(h):
+            r, g, b, a = pixels[x, y]
+            if a > 0:
+                if b > 100 and b > r + 20 and b > g + 20:
+                    pixels[x, y] = (0, 0, 0, a)
+    return img
+
+
+def _sample_image(w, h, seed=0):
+    """Random RGBA image with plenty of gray, blue and transparent pixels."""
+    rng = np.random.default_rng(seed)
+    arr = rng.integers(0, 256, size=(h, w, 4), dtype=np.uint8)
+    gray = rng.integers(180, 256, size=(h, w), dtype=np.uint8)
+    half = rng.random((h, w)) < 0.5
+    for c in range(3):
+        arr[..., c][half] = np.clip(gray[half].astype(np.int16) + rng.integers(-12, 13), 0, 255)
+    arr[..., 3][rng.random((h, w)) < 0.1] = 0
+    return Image.fromarray(arr, "RGBA")
+
+
+if __name__ == "__main__":
+    ## ---------- Equivalence check / بررسی یکسان بودن نتیجه ----------
+    for size in [(1, 1), (7, 3), (64, 48)]:
+        for kwargs in [{}, {"threshold": 180}, {"alpha": 0}]:
+            src = _sample_image(*size)
+            assert replace_gray_with_white(src.copy(), **kwargs).tobytes() == \
+                _replace_gray_with_white_loop(src.copy(), **kwargs).tobytes(), (size, kwargs)
+        src = _sample_image(*size, seed=1)
+        assert replace_blue_with_black(src.copy()).tobytes() == \
+            _replace_blue_with_black_loop(src.copy()).tobytes(), size
+    print("Array versions match the pixel loops.")
+
+    ## ---------- Benchmark on a 6x6 inch, 300 dpi render / بنچمارک روی تصویر ۳۰۰ dpi ----------
+    src = _sample_image(1800, 1800)
+    for name, fast, slow in [
+        ("replace_gray_with_white", replace_gray_with_white, _replace_gray_with_white_loop),
+        ("replace_blue_with_black", replace_blue_with_black, _replace_blue_with_black_loop),
+    ]:
+        t0 = time.perf_counter()
+        slow(src.copy())
+        t1 = time.perf_counter()
+        fast(src.copy())
+        t2 = time.perf_counter()
+        print(f"{name}: loop {t1 - t0:.2f}s, numpy {t2 - t1:.3f}s ({(t1 - t0) / (t2 - t1):.0f}x)")
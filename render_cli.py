@@ -0,0 +1,140 @@
+## ========================================================================================================
+## SUMMARY / خلاصه
+##
+## Headless command line for the render pipelines, for the render farm and for batch scripts.
+## e24.py, "e26 with comment.py" and "final e28 0,0,0 problem method 2.py" ask for the workbook
+## with a Tk file dialog, and edit15.py asks for the output folder; this entry point takes
+## everything as arguments and never imports tkinter.
+##
+## USAGE / استفاده:
+##     python render_cli.py dxf data.xlsx                        # DXF -> annotated PNG next to each DXF (e28)
+##     python render_cli.py dxf data.xlsx --format svg --output-dir out --workers 8
+##     python render_cli.py dxf data.xlsx --layout e26            # labels as "e26 with comment.py" drew them
+##     python render_cli.py labels data.xlsx --output-dir out_images   # template labels (edit15)
+##     python render_cli.py watch data.xlsx --interval 1          # re-render rows as files change
+##
+## Common options / گزینه‌های مشترک:
+##     --sheet NAME|INDEX   sheet of the workbook (default 0); a number is used as a 0-based
+##                          index only when the workbook has no sheet with that name ("2024")
+##     --header ROW         header row, 0-based like pandas (default 1)
+##     --output-dir DIR     where the images go; only the file name of each DXF is kept, so a
+##                          row whose name is already taken by an earlier row is reported as failed
+##     --cache-dir DIR      where the sheet sidecar goes (default: next to the workbook)
+##
+## --layout e28|e26|e24 (dxf, watch) picks the label style of that script (default e28, see
+## batch_render.LAYOUTS): e26/e24 keep ezdxf's colours, normal weight labels and Subshape 0.2
+## above Th; e24 writes "H:" instead of "HL:".
+##
+## Exit status: 0 when every row was rendered, 1 when some rows failed, 2 for bad arguments.
+## ========================================================================================================
+
+import argparse
+import os
+import sys
+
+
+def resolve_sheet(excel, value):
+    """Sheet name, or the 0-based index for a number that is not the name of a sheet."""
+    if not isinstance(value, str) or not value.isdigit():
+        return value
+    import pandas as pd
+
+    ## A sheet named "2024" wins over the 2025th sheet / نام شیت مقدم بر شماره است
+    with pd.ExcelFile(excel) as book:
+        return value if value in book.sheet_names else int(value)
+
+
+## Same keys as batch_render.LAYOUTS, listed here so `--help` does not import matplotlib/ezdxf
+## مثل batch_render.LAYOUTS؛ برای اجرای سریع --help اینجا تکرار شده
+LAYOUT_CHOICES = ("e28", "e26", "e24")
+
+
+def _existing_file(value):
+    if not os.path.isfile(value):
+        raise argparse.ArgumentTypeError(f"no such file: {value}")
+    return value
+
+
+def _workers(value):
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return n
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="render_cli.py", description="Render section images from the Excel database without any GUI.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("excel", type=_existing_file, help="Excel database (.xlsx/.xls)")
+    common.add_argument("--sheet", default=0, help="sheet name, or 0-based index when no sheet has that name (default: 0)")
+    common.add_argument("--header", type=int, default=1, help="0-based header row (default: 1)")
+    common.add_argument("--cache-dir", help="folder for the sheet cache (default: next to the workbook)")
+
+    ## ---------- DXF pipeline (final e28) / خط رندر DXF ----------
+    dxf = sub.add_parser("dxf", parents=[common], help="annotate the DXF of every row (final e28)")
+    dxf.add_argument("--output-dir", help="write the images here instead of next to each DXF")
+    dxf.add_argument("--format", choices=("png", "svg", "pdf"), default="png", help="output format (default: png)")
+    dxf.add_argument("--workers", type=_workers, default=os.cpu_count(), help="render processes (default: one per core)")
+    dxf.add_argument("--no-incremental", action="store_true", help="render every row, ignoring the manifest")
+    dxf.add_argument("--layout", choices=LAYOUT_CHOICES, default="e28", help="label layout of that script (default: e28)")
+
+    ## ---------- Watch mode (render_watch.py) / حالت پایش ----------
+    watch = sub.add_parser("watch", parents=[common], help="keep running and re-render the rows whose inputs change")
+    watch.add_argument("--output-dir", help="write the images here instead of next to each DXF")
+    watch.add_argument("--format", choices=("png", "svg", "pdf"), default="png", help="output format (default: png)")
+    watch.add_argument("--workers", type=_workers, default=os.cpu_count(), help="render processes (default: one per core)")
+    watch.add_argument("--interval", type=float, default=1.0, help="seconds between two scans (default: 1)")
+    watch.add_argument("--layout", choices=LAYOUT_CHOICES, default="e28", help="label layout of that script (default: e28)")
+
+    ## ---------- Template labels (edit15) / برچسب روی تصاویر نمونه ----------
+    labels = sub.add_parser("labels", parents=[common], help="write the dimensions on the template images (edit15)")
+    labels.add_argument("--output-dir", default="out_images", help="output folder (default: out_images)")
+    return parser
+
+
+def run_dxf(args):
+    ## Imported here so `--help` and argument errors stay fast / ایمپورت دیرهنگام برای شروع سریع
+    from batch_render import iter_jobs, render_batch, report
+    from render_manifest import MANIFEST_NAME, RenderManifest
+
+    jobs = iter_jobs(args.excel, sheet_name=args.sheet, header=args.header, cache_dir=args.cache_dir,
+                     output_format=args.format, output_dir=args.output_dir, layout=args.layout)
+    manifest = None
+    if not args.no_incremental:
+        manifest = RenderManifest(os.path.join(os.path.dirname(os.path.abspath(args.excel)), MANIFEST_NAME))
+    results = render_batch(jobs, workers=args.workers, manifest=manifest)
+    ok = report(results)
+    print(f"{len(results)} rows, {'all rendered' if ok else 'some failed'}.")
+    return 0 if ok else 1
+
+
+def run_labels(args):
+    import edit15
+
+    edit15.main(output_dir=args.output_dir, excel_file=args.excel, sheet_name=args.sheet,
+                header=args.header, cache_dir=args.cache_dir)
+    return 0
+
+
+def run_watch(args):
+    from render_watch import Watcher
+
+    Watcher(args.excel, sheet_name=args.sheet, header=args.header, cache_dir=args.cache_dir,
+            output_format=args.format, output_dir=args.output_dir, workers=args.workers,
+            interval=args.interval, layout=args.layout).run()
+    return 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.sheet = resolve_sheet(args.excel, args.sheet)
+    return {"dxf": run_dxf, "labels": run_labels, "watch": run_watch}[args.command](args)
+
+
+## Worker processes re-import this file on Windows, so only the main process may run it
+## پردازه‌های کارگر در ویندوز این فایل را دوباره import می‌کنند؛ فقط پردازه اصلی اجرا کند
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+## ========================================================================================================
+## SUMMARY / خلاصه
+##
+## Manifest for incremental builds of the DXF -> PNG/SVG/PDF pipeline. For every output file
+## it stores a hash of the row's inputs (row values, DXF content hash, label-layout parameters
+## and render config) together with the size and mtime of the file that was written. On the
+## next run a row is skipped when its hash is the same and the file on disk is the one we wrote, so
+## editing one row of the Excel database only re-renders that row.
+##
+## FILE / فایل:
+## - JSON: {out_path: {"hash": ..., "size": ..., "mtime_ns": ...}}
+## ========================================================================================================
+
+import hashlib
+import json
+import os
+
+MANIFEST_NAME = "render_manifest.json"
+
+_hashes = {}  ## (path, mtime, size) -> sha256, so each DXF is hashed once per run / هر DXF یک بار
+
+
+def file_hash(path):
+    """sha256 of a file's content, computed once per (path, mtime, size) in this process."""
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    if key not in _hashes:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        _hashes[key] = h.hexdigest()
+    return _hashes[key]
+
+
+class RenderManifest:
+    """Input hashes of previously rendered PNGs, loaded from and saved to a JSON file."""
+
+    def __init__(self, path=MANIFEST_NAME):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable manifest {path}: {e}")  ## Start a full build / ساخت کامل
+
+    def job_hash(self, job, settings):
+        """Hash of everything that decides the output file of one job."""
+        try:
+            dxf = file_hash(job["dxf_path"])
+        except OSError:
+            dxf = None  ## Missing DXF: never current, the renderer reports it / DXF موجود نیست
+        payload = json.dumps({"row": job, "dxf": dxf, "settings": settings}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def is_current(self, out_path, h):
+        """True when the output was written from the same inputs and has not been touched since."""
+        entry = self.entries.get(out_path)
+        if entry is None or entry["hash"] != h:
+            return False
+        try:
+            st = os.stat(out_path)
+        except OSError:
+            return False
+        return st.st_size == entry["size"] and st.st_mtime_ns == entry["mtime_ns"]
+
+    def record(self, out_path, h):
+        st = os.stat(out_path)
+        self.entries[out_path] = {"hash": h, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+    def save(self):
+        ## Write to a temp file first so an interrupted run cannot corrupt the manifest
+        ## اول در فایل موقت بنویس تا اجرای نیمه‌کاره مانیفست را خراب نکند
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
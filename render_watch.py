@@ -0,0 +1,180 @@
+## ========================================================================================================
+## SUMMARY / خلاصه
+##
+## Watch mode for the DXF annotation pipeline ("final e28 ...", render_cli.py dxf). Instead of
+## running the whole script again after every edit, one long-running process polls the mtimes
+## of the workbook and of every DXF/.sct the rows point at, and re-renders only what changed:
+##
+## - workbook saved  -> the sheet is read again and compared with the previous rows; only new
+##                      or edited rows are rendered (removed rows are reported, their images kept)
+## - DXF saved       -> only the rows that use that DXF are rendered
+## - .sct saved      -> the images are drawn from the DXF, so the rows wait for the re-exported
+##                      DXF; a note is printed while the DXF is older than its .sct
+##
+## The process stays warm between rebuilds: with workers > 1 the same process pool is reused,
+## so every worker keeps its parsed DXFs (dxf_cache.py) and drawn geometry (batch_render.py);
+## with workers=1 the caches live in this process. Polling needs no extra package and works on
+## network drives, where inotify does not. The render manifest is kept up to date, so a normal
+## incremental run after the watcher stops starts from the same state.
+##
+## USAGE / استفاده:
+##     python render_cli.py watch data.xlsx --interval 1
+##     python render_watch.py data.xlsx
+## Stop with Ctrl+C / توقف با Ctrl+C
+## ========================================================================================================
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from batch_render import DEFAULT_LAYOUT, iter_jobs, render_batch, report
+from render_manifest import MANIFEST_NAME, RenderManifest
+
+POLL_INTERVAL = 1.0  ## Seconds between two scans of the watched files / فاصله بررسی فایل‌ها
+SETTLE_TIME = 0.5    ## A file must stay unchanged this long before it is read / صبر تا پایان ذخیره فایل
+
+
+def _stamp(path):
+    """(mtime, size) of a file, or None when it does not exist (yet)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _row_key(job):
+    ## NaN != NaN, so jobs are compared through their JSON text / مقایسه از راه متن JSON
+    return json.dumps(job, sort_keys=True, default=str)
+
+
+def sct_for_job(job):
+    return os.path.splitext(job["dxf_path"])[0] + ".sct"
+
+
+class Watcher:
+    """Keeps the images of one workbook up to date, rendering only rows whose inputs changed."""
+
+    def __init__(self, excel_path, sheet_name=0, header=1, cache_dir=None, output_format="png",
+                 output_dir=None, workers=None, interval=POLL_INTERVAL, layout=DEFAULT_LAYOUT):
+        self.excel_path = excel_path
+        self.job_args = dict(sheet_name=sheet_name, header=header, cache_dir=cache_dir,
+                             output_format=output_format, output_dir=output_dir, layout=layout)
+        self.workers = workers or os.cpu_count() or 1
+        self.interval = interval
+        self.manifest = RenderManifest(os.path.join(os.path.dirname(os.path.abspath(excel_path)), MANIFEST_NAME))
+        self.jobs = {}    ## out_path -> job of the last sheet read / کارهای آخرین خواندن شیت
+        self.keys = {}    ## out_path -> _row_key(job)
+        self.errors = []  ## Error jobs (bad cells, output name clashes) / ردیف‌های خطادار
+        self.stamps = {}  ## watched path -> (mtime, size) / وضعیت فایل‌های تحت نظر
+        self.pool = None
+
+    ## ---------- Files / فایل‌ها ----------
+    def watched(self):
+        paths = {self.excel_path}
+        for job in self.jobs.values():
+            paths.add(job["dxf_path"])
+            paths.add(sct_for_job(job))
+        return paths
+
+    def changed(self):
+        """Watched paths whose stamp differs from the last scan, waiting until they settle."""
+        paths = self.watched()
+        now = {p: _stamp(p) for p in paths}
+        changed = {p for p in paths if now[p] != self.stamps.get(p)}
+        while changed:
+            ## Excel and CAD programs write in several steps / ذخیره فایل چند مرحله‌ای است
+            time.sleep(SETTLE_TIME)
+            again = {p: _stamp(p) for p in changed}
+            if all(again[p] == now[p] for p in changed):
+                break
+            now.update(again)
+        self.stamps.update(now)
+        return changed
+
+    ## ---------- Rendering / رندر ----------
+    def render(self, jobs, reason):
+        if not jobs:
+            return
+        t0 = time.perf_counter()
+        results = render_batch(jobs, workers=self.workers, manifest=self.manifest, pool=self.pool)
+        ok = report(results)
+        print(f"{reason}: {len(results)} row(s) in {time.perf_counter() - t0:.1f}s"
+              f"{'' if ok else ', some failed'}.")
+
+    def reload_sheet(self):
+        """
+        Read the sheet again; returns the new or edited jobs, or None when it cannot be read.
+        iter_jobs() yields one valid job per output file (later rows of the same DXF are
+        skipped), so self.jobs stays keyed by out_path; error jobs are kept apart.
+        """
+        jobs, errors = {}, []
+        try:
+            for job in iter_jobs(self.excel_path, **self.job_args):
+                if "error" in job:
+                    errors.append(job)  ## Reported, never rendered / فقط گزارش می‌شود
+                else:
+                    jobs[job["out_path"]] = job
+        except Exception as e:  ## Half-saved or locked workbook: try again next scan / فایل در حال ذخیره
+            print(f"Cannot read {self.excel_path} yet: {e}")
+            self.stamps.pop(self.excel_path, None)
+            return None
+        keys = {path: _row_key(job) for path, job in jobs.items()}
+        edited = [job for path, job in jobs.items() if self.keys.get(path) != keys[path]]
+        removed = len(self.jobs.keys() - jobs.keys())
+        if removed:
+            print(f"{removed} row(s) removed from the sheet; their images were left in place.")
+        self.jobs, self.keys, self.errors = jobs, keys, errors
+        return edited
+
+    def step(self, changed):
+        """Render what the changed files affect."""
+        jobs, reasons, errors = {}, [], []
+        if self.excel_path in changed:
+            edited = self.reload_sheet()
+            if edited or (edited is not None and self.errors):
+                jobs.update((job["out_path"], job) for job in edited)
+                errors = self.errors  ## Reported again until the sheet is fixed / تا اصلاح شیت گزارش می‌شود
+                reasons.append("workbook")
+            for job in self.jobs.values():  ## Rows added with new DXFs start watched / DXFهای جدید
+                for p in (job["dxf_path"], sct_for_job(job)):
+                    self.stamps.setdefault(p, _stamp(p))
+
+        dxfs = {p for p in changed if p.lower().endswith(".dxf")}
+        if dxfs:
+            jobs.update((path, job) for path, job in self.jobs.items() if job["dxf_path"] in dxfs)
+            reasons.append(f"{len(dxfs)} DXF file(s)")
+        self.render(list(jobs.values()) + errors, " + ".join(reasons) + " changed")
+
+        for sct in sorted(p for p in changed if p.lower().endswith(".sct")):
+            dxf_stamp, sct_stamp = _stamp(os.path.splitext(sct)[0] + ".dxf"), _stamp(sct)
+            if sct_stamp is not None and (dxf_stamp is None or dxf_stamp[0] < sct_stamp[0]):
+                print(f"{sct} changed; waiting for its DXF to be exported again.")
+
+    def run(self):
+        """Initial incremental build, then poll until interrupted."""
+        if self.workers > 1:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            self.stamps[self.excel_path] = _stamp(self.excel_path)
+            edited = self.reload_sheet() or []
+            self.render(edited + self.errors, "Initial build")  ## Manifest skips rows that are up to date / ردیف‌های به‌روز رد می‌شوند
+            self.changed()  ## Remember the current stamps of the DXF/.sct files / ثبت وضعیت فعلی
+            print(f"Watching {self.excel_path} and {len(self.watched()) - 1} DXF/.sct files (Ctrl+C to stop).")
+            while True:
+                time.sleep(self.interval)
+                changed = self.changed()
+                if changed:
+                    self.step(changed)
+        except KeyboardInterrupt:
+            print("Stopped watching.")
+        finally:
+            if self.pool is not None:
+                self.pool.shutdown(cancel_futures=True)
+
+
+if __name__ == "__main__":
+    import sys
+
+    Watcher(sys.argv[1] if len(sys.argv) > 1 else "data.xlsx").run()
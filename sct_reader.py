@@ -0,0 +1,197 @@
+## ========================================================================================================
+## SUMMARY / خلاصه
+##
+## Reader for the binary .sct section files in templates/model (the files the "File Address"
+## column points at). read_sct() decodes the file directly; the part segments are a NumPy view
+## on the file bytes (no copy):
+##
+##     sec = read_sct("templates/model/box beam 1.56 x 2.0.sct")
+##     sec.description, sec.material.name, sec.material.Fy
+##     sec.parts[0].segments["length"], sec.parts[0].walk()
+##     sec.size()                               # (width, height) in inches, or None
+##     sct_dimensions(path)                     # (width, height), ValueError when not decoded
+##
+## WHERE IT IS USED / محل استفاده:
+## - e17.py takes the width/height from the .sct with sct_dimensions() when the DXF next to
+##   it has not been exported; a section the reader cannot size (see LIMITS) is reported
+##   with a clear error instead of a missing-file error.
+## - batch_render.py draws the outline from the DXF, which the .sct cannot replace yet; a row
+##   whose DXF is missing but whose .sct exists is reported as "export the DXF from the .sct".
+##
+## FORMAT (little endian, as far as it is decoded) / ساختار فایل:
+##     u16      version (7)
+##     f64      saved date, days since 1899-12-30 (OLE date)
+##     char[40] author                  char[80] description
+##     u16      flag (0 or 0xFFFF, meaning unknown)
+##     char[24] material name           f32[33] material values
+##              (0-3 = E, 4 = G, 5-8 = Fy, 15 = Fu; the rest is kept but not named)
+##     u8       number of parts, then for every part:
+##         char[20] part name           u16, u16 (unknown)
+##         f32      default bend radius u8, u8 (unknown, always 1, 1)
+##         f32 x, f32 y                 start point of the segment walk
+##         f32      thickness           u8 number of segments
+##         segments, 25 bytes each:     f32 length, f32 angle (radians, absolute direction),
+##                                      f32 bend radius, u8 kind (1 or 2), f32 u1, f32 u2, f32 u3
+##                                      (u3 is usually length / 2; u1, u2 are not decoded)
+##     u32      length, then an RTF report of the full and net section properties
+##              (empty in most files)
+##
+## LIMITS / محدودیت‌ها:
+## - walk() follows the segments with sharp corners; the bend radii are not applied.
+## - The placement of the parts of a multi-part section (box beam, step beam) is not decoded:
+##   each part is in its own coordinates, so the parts cannot be assembled into one outline
+##   yet. size() therefore uses the Width/Height of the RTF report when it is present and the
+##   segment walk only for single-part sections (it matches the DXF extents of the braces).
+##   The exported DXF is therefore still needed for every section.
+##
+## Run this file directly to print every .sct of a folder next to the extents of its DXF:
+##     python sct_reader.py templates/model
+## ========================================================================================================
+
+import os
+import re
+import struct
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+import numpy as np
+
+SCT_VERSION = 7
+
+SEGMENT_DTYPE = np.dtype([
+    ("length", "<f4"), ("angle", "<f4"), ("radius", "<f4"), ("kind", "u1"),
+    ("u1", "<f4"), ("u2", "<f4"), ("u3", "<f4"),
+])  ## Packed, 25 bytes / بدون فاصله
+
+Material = namedtuple("Material", "name values E G Fy Fu")
+SctPart = namedtuple("SctPart", "name thickness radius start segments")
+SctSection = namedtuple("SctSection", "version saved author description material parts properties")
+
+_HEADER = struct.Struct("<Hd40s80sH24s33f")
+_PART_HEADER = struct.Struct("<20sHHfBBfffB")
+_OLE_EPOCH = datetime(1899, 12, 30)
+
+
+def _text(raw):
+    return raw.decode("latin-1").rstrip(" \x00")
+
+
+## ---------- Part geometry / هندسه قطعه ----------
+def walk(part):
+    """(xs, ys) corner points of the part, following the segments from the start point."""
+    seg = part.segments
+    angle = seg["angle"].astype(np.float64)
+    length = seg["length"].astype(np.float64)
+    xs = np.concatenate(([part.start[0]], part.start[0] + np.cumsum(length * np.cos(angle))))
+    ys = np.concatenate(([part.start[1]], part.start[1] + np.cumsum(length * np.sin(angle))))
+    return xs, ys
+
+
+SctPart.walk = walk
+
+
+def size(section):
+    """(width, height) of the section in inches, or None when it cannot be told from the file."""
+    full = section.properties.get("full", {})
+    if "Width.1" in full and "Height" in full:
+        return full["Width.1"], full["Height"]  ## The first Width is the flat (developed) width
+    if len(section.parts) == 1:
+        part = section.parts[0]
+        xs, ys = part.walk()
+        return float(np.ptp(xs)), float(np.ptp(ys))  ## Segment lengths are outside dimensions / ابعاد بیرونی
+    return None
+
+
+SctSection.size = size
+
+
+## ---------- Section properties report / گزارش مشخصات مقطع ----------
+_RTF_CONTROL = re.compile(r"\\'[0-9a-f]{2}|\\[a-z]+-?\d* ?|[{}]")
+_PROPERTY = re.compile(r"([A-Za-z][\w.]*(?:\([a-z]\))?)\s+(-?\d+(?:\.\d+)?)\s*(?:in\^\d|in|k/ft|deg)")
+
+
+def parse_properties(rtf):
+    """{"full": {name: value}, "net": {...}} from the RTF report; repeated names get .1, .2 ..."""
+    text = _RTF_CONTROL.sub(" ", rtf.replace("\\f2 a\\f1", "alpha"))
+    result, current = {}, None
+    for line in text.splitlines():
+        if "Full Section Properties" in line:
+            current = result.setdefault("full", {})
+        elif "Net Section Properties" in line:
+            current = result.setdefault("net", {})
+        elif current is not None:
+            for name, value in _PROPERTY.findall(line):
+                key, n = name, 0
+                while key in current:
+                    n += 1
+                    key = f"{name}.{n}"
+                current[key] = float(value)
+    return result
+
+
+## ---------- Reader / خواندن فایل ----------
+def read_sct(path):
+    """Decode one .sct file. Raises ValueError when the layout does not match."""
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        (version, saved, author, description, _flag, material_name,
+         *values) = _HEADER.unpack_from(data, 0)
+        if version != SCT_VERSION:
+            raise ValueError(f"unsupported .sct version {version}")
+        values = np.array(values, dtype=np.float32)
+        material = Material(_text(material_name), values, float(values[0]), float(values[4]),
+                            float(values[5]), float(values[15]))
+
+        part_count = data[_HEADER.size]
+        offset = _HEADER.size + 1
+        parts = []
+        for _ in range(part_count):
+            name, _u1, _u2, radius, _f1, _f2, x, y, thickness, count = _PART_HEADER.unpack_from(data, offset)
+            offset += _PART_HEADER.size
+            segments = np.frombuffer(data, SEGMENT_DTYPE, count, offset)  ## View, no copy / بدون کپی
+            offset += count * SEGMENT_DTYPE.itemsize
+            parts.append(SctPart(_text(name), float(thickness), float(radius), (float(x), float(y)), segments))
+
+        (rtf_length,) = struct.unpack_from("<I", data, offset)
+        rtf = data[offset + 4:offset + 4 + rtf_length].decode("latin-1")
+        if offset + 4 + rtf_length != len(data):
+            raise ValueError(f"{len(data) - offset - 4 - rtf_length} unexpected trailing bytes")
+    except struct.error as e:
+        raise ValueError(f"{path}: truncated .sct file ({e})") from None
+    except ValueError as e:
+        raise ValueError(f"{path}: {e}") from None
+
+    return SctSection(version, _OLE_EPOCH + timedelta(days=saved), _text(author), _text(description),
+                      material, parts, parse_properties(rtf) if rtf else {})
+
+
+def sct_dimensions(path):
+    """(width, height) in inches read from a .sct file. Raises ValueError when the file does not tell."""
+    wh = read_sct(path).size()
+    if wh is None:
+        raise ValueError(f"{path}: the size of a multi-part section without a properties report "
+                         f"cannot be read from the .sct yet; export its DXF")
+    return wh
+
+
+if __name__ == "__main__":
+    ## ---------- Dump a folder and compare with the DXF extents / مقایسه با DXF ----------
+    import sys
+
+    from dxf_extents import dxf_extents
+
+    folder = sys.argv[1] if len(sys.argv) > 1 else os.path.join("templates", "model")
+    for name in sorted(os.listdir(folder)):
+        if not name.lower().endswith(".sct"):
+            continue
+        sec = read_sct(os.path.join(folder, name))
+        print(f"{name}: {sec.description!r}, {sec.material.name} (E={sec.material.E:g}, Fy={sec.material.Fy:g}), "
+              f"{len(sec.parts)} part(s), saved {sec.saved:%Y-%m-%d}")
+        for part in sec.parts:
+            print(f"    {part.name}: t={part.thickness:.4f}, {len(part.segments)} segments")
+        dxf = os.path.join(folder, "All Type " + os.path.splitext(name)[0] + ".dxf")
+        ext = dxf_extents(dxf) if os.path.exists(dxf) else None
+        wh = sec.size()
+        print(f"    size from .sct: {'-' if wh is None else f'{wh[0]:.3f} x {wh[1]:.3f}'}"
+              f"   DXF: {'-' if ext is None else f'{ext.width:.3f} x {ext.height:.3f}'}")
@@ -0,0 +1,307 @@
+## ========================================================================================================
+## SUMMARY / خلاصه
+##
+## Columnar sidecar cache for the section databases (data.xlsx, database.xlsx). Parsing the
+## XLSX XML takes seconds on every run before anything is rendered. The first run converts the
+## sheet into a NumPy .npz file next to the workbook (or in cache_dir); later runs load the
+## sidecar directly as long as the workbook's sha256 has not changed.
+##
+## A cached read returns exactly what the workbook read returns (same values, same Python
+## types, same DataFrame dtypes):
+## - columns of only ints or only floats are stored as int64/float64 arrays
+## - text columns are stored as text plus a mask of the empty cells
+## - anything else (ints with blanks, numbers mixed with text, dates, bools) is stored as text
+##   with a type tag per cell, so 1 comes back as 1 and not as 1.0
+## - a cell of a type the tags do not cover turns the cache off for that sheet (it is read
+##   from the workbook every time, with a note)
+##
+## The sidecar is written in chunks of CHUNK_ROWS rows while the workbook is streamed, and
+## read back one chunk at a time, so memory does not grow with the size of the sheet. The
+## worksheet row number of every row is stored next to its chunk (iter_sheet_rows(row_numbers=True)).
+##
+## float_cols (final e28: WT/H/WB/HR/Thickness/xl/yb/...) are converted with float(); empty
+## cells become NaN and text that is not a number is kept as it is, so the caller can report
+## the row instead of losing it.
+##
+## USAGE / استفاده:
+##     df = load_sheet("data.xlsx", header=1, dtype=str)                    # DataFrame
+##     for row in iter_sheet_rows(path, header=1, float_cols=FLOAT_COLS):   # dict rows
+## ========================================================================================================
+
+import hashlib
+import json
+import os
+import zipfile
+from datetime import date, datetime, time, timedelta
+
+import numpy as np
+import pandas as pd
+
+from excel_rows import NAN, isna, iter_rows
+from render_manifest import file_hash
+
+SIDECAR_VERSION = 4
+CHUNK_ROWS = 4096  ## Rows per sidecar chunk, the most that is buffered / حداکثر ردیف در حافظه
+
+
+def sidecar_path(path, cache_dir=None, **params):
+    """Sidecar file for this workbook and these read parameters."""
+    key = json.dumps({"v": SIDECAR_VERSION, **params}, sort_keys=True, default=str)
+    tag = hashlib.sha256(key.encode("utf-8")).hexdigest()[:10]
+    folder = cache_dir or os.path.dirname(os.path.abspath(path))
+    return os.path.join(folder, f"{os.path.basename(path)}.{tag}.npz")
+
+
+def as_float(value):
+    """float(value) for numbers and numeric text, NaN for an empty cell; other text is returned unchanged."""
+    if isna(value):
+        return NAN
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value
+
+
+## ---------- Cell type tags / برچسب نوع هر خانه ----------
+class _Uncacheable(Exception):
+    pass
+
+
+_BLANK, _STR, _INT, _FLOAT, _BOOL, _DATETIME, _DATE, _TIME, _TIMEDELTA = range(9)
+
+
+def _encode_cell(v):
+    """(tag, text) of one cell value."""
+    if v is None or v is pd.NaT or (isinstance(v, float) and v != v):
+        return _BLANK, ""
+    if isinstance(v, str):
+        return _STR, v
+    if isinstance(v, (bool, np.bool_)):
+        return _BOOL, "1" if v else ""
+    if isinstance(v, (int, np.integer)):
+        return _INT, str(int(v))
+    if isinstance(v, (float, np.floating)):
+        return _FLOAT, repr(float(v))
+    if isinstance(v, datetime):
+        if getattr(v, "nanosecond", 0):
+            raise _Uncacheable("timestamp with nanoseconds")
+        return _DATETIME, v.isoformat()
+    if isinstance(v, date):
+        return _DATE, v.isoformat()
+    if isinstance(v, time):
+        return _TIME, v.isoformat()
+    if isinstance(v, timedelta):
+        return _TIMEDELTA, f"{v.days} {v.seconds} {v.microseconds}"
+    raise _Uncacheable(f"cells of type {type(v).__name__}")
+
+
+def _decode_cell(tag, text):
+    if tag == _BLANK:
+        return NAN
+    if tag == _STR:
+        return text
+    if tag == _INT:
+        return int(text)
+    if tag == _FLOAT:
+        return float(text)
+    if tag == _BOOL:
+        return text == "1"
+    if tag == _DATETIME:
+        return datetime.fromisoformat(text)
+    if tag == _DATE:
+        return date.fromisoformat(text)
+    if tag == _TIME:
+        return time.fromisoformat(text)
+    return timedelta(*map(int, text.split()))
+
+
+## ---------- Column <-> array conversion / تبدیل ستون به آرایه ----------
+def _to_array(values):
+    """Return (kind, data, extra) for one column given as a list of cell values."""
+    if all(type(v) is int for v in values):
+        return "i", np.array(values, dtype=np.int64), None
+    if all(type(v) is float for v in values):
+        return "f", np.array(values, dtype=np.float64), None
+    if all(type(v) is str or isna(v) for v in values):
+        mask = np.array([not isinstance(v, str) for v in values], dtype=bool)
+        return "s", np.array([v if isinstance(v, str) else "" for v in values], dtype=str), mask
+    tags, texts = zip(*map(_encode_cell, values)) if values else ((), ())
+    return "o", np.array(texts, dtype=str), np.array(tags, dtype=np.uint8)
+
+
+def _from_array(kind, data, extra):
+    """The column as a list of Python values, the inverse of _to_array."""
+    if kind in ("i", "f"):
+        return data.tolist()
+    if kind == "s":
+        return [NAN if m else v for v, m in zip(data.tolist(), extra.tolist())]
+    return [_decode_cell(t, v) for t, v in zip(extra.tolist(), data.tolist())]
+
+
+class _SidecarWriter:
+    """Writes the sidecar chunk by chunk into a temporary file, renamed into place by finish()."""
+
+    def __init__(self, sidecar, source_hash, label):
+        self.sidecar, self.source_hash, self.label = sidecar, source_hash, label
+        self.tmp = sidecar + ".tmp"
+        self.chunks = 0
+        os.makedirs(os.path.dirname(sidecar), exist_ok=True)
+        self._zip = zipfile.ZipFile(self.tmp, "w", zipfile.ZIP_STORED)
+
+    def _array(self, name, arr):
+        with self._zip.open(name + ".npy", "w", force_zip64=True) as f:
+            np.lib.format.write_array(f, np.asarray(arr), allow_pickle=False)
+
+    def _columns(self, prefix, columns):
+        kinds = []
+        for i, values in enumerate(columns):
+            kind, data, extra = _to_array(values)
+            kinds.append(kind)
+            self._array(f"{prefix}c{i}", data)
+            if extra is not None:
+                self._array(f"{prefix}x{i}", extra)
+        self._array(f"{prefix}kinds", np.array(kinds, dtype=str))
+
+    def add_chunk(self, columns, row_numbers=None):
+        """Write one chunk, given as one list of values per column (and the worksheet row numbers)."""
+        if self._zip is None:
+            return
+        try:
+            self._columns(f"k{self.chunks}", columns)
+            if row_numbers is not None:
+                self._array(f"k{self.chunks}rows", np.array(row_numbers, dtype=np.int64))
+            self.chunks += 1
+        except _Uncacheable as e:
+            print(f"Not caching {self.label}: {e} cannot be stored in the sidecar.")
+            self.abort()
+
+    def finish(self, columns, dtypes=None):
+        if self._zip is None:
+            return
+        try:
+            self._columns("h", [[c] for c in columns])  ## Column names keep their type too / نام ستون‌ها
+        except _Uncacheable as e:
+            print(f"Not caching {self.label}: {e} cannot be stored in the sidecar.")
+            self.abort()
+            return
+        self._array("meta", np.array(json.dumps({"chunks": self.chunks, "columns": len(columns), "dtypes": dtypes})))
+        self._array("source_hash", np.array(self.source_hash))
+        self._zip.close()
+        self._zip = None
+        os.replace(self.tmp, self.sidecar)  ## Never leave a half-written sidecar / فایل نیمه‌کاره باقی نماند
+
+    def abort(self):
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+            os.remove(self.tmp)
+
+
+def _open(sidecar, source_hash):
+    """Return (npz, columns, meta) when the sidecar is fresh, otherwise None. The caller closes npz."""
+    if not os.path.exists(sidecar):
+        return None
+    z = None
+    try:
+        z = np.load(sidecar, allow_pickle=False)
+        if str(z["source_hash"]) != source_hash:
+            z.close()
+            return None
+        meta = json.loads(str(z["meta"]))
+        columns = [col[0] for col in _chunk(z, "h", meta["columns"])]
+        return z, columns, meta
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+        if z is not None:
+            z.close()
+        print(f"Ignoring unreadable sidecar {sidecar}: {e}")
+        return None
+
+
+def _chunk(z, prefix, n_columns):
+    kinds = z[f"{prefix}kinds"].tolist()
+    return [_from_array(kinds[i], z[f"{prefix}c{i}"], z[f"{prefix}x{i}"] if kinds[i] in ("s", "o") else None)
+            for i in range(n_columns)]
+
+
+## ---------- Public API / توابع اصلی ----------
+def load_sheet(path, sheet_name=0, header=0, dtype=None, float_cols=(), cache_dir=None):
+    """pd.read_excel(path, header=header, dtype=dtype) through the sidecar cache."""
+    float_cols = set(float_cols)
+    sidecar = sidecar_path(path, cache_dir, reader="pandas", sheet=sheet_name, header=header,
+                           dtype=str(dtype), float_cols=sorted(float_cols), usecols=None)
+    source_hash = file_hash(path)
+    cached = _open(sidecar, source_hash)
+    if cached is not None:
+        z, columns, meta = cached
+        with z:
+            values = [[] for _ in columns]
+            for k in range(meta["chunks"]):
+                for col, part in zip(values, _chunk(z, f"k{k}", len(columns))):
+                    col.extend(part)
+        df = pd.DataFrame({i: pd.Series(v, dtype=object) for i, v in enumerate(values)})
+        df.columns = columns
+        for i, dt in enumerate(meta["dtypes"]):
+            if dt != "object":
+                df.isetitem(i, df.iloc[:, i].astype(dt))  ## Same dtypes as read_excel / همان نوع ستون‌ها
+        return df
+
+    df = pd.read_excel(path, sheet_name=sheet_name, header=header, dtype=dtype)
+    for col in float_cols & set(df.columns):
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    writer = _SidecarWriter(sidecar, source_hash, path)
+    try:
+        for start in range(0, len(df), CHUNK_ROWS):
+            writer.add_chunk([df.iloc[start:start + CHUNK_ROWS, i].tolist() for i in range(df.shape[1])])
+        writer.finish(list(df.columns), [str(t) for t in df.dtypes])
+    finally:
+        writer.abort()  ## No-op after finish() / بعد از finish کاری نمی‌کند
+    return df
+
+
+def iter_sheet_rows(path, sheet_name=0, header=0, dtype=None, float_cols=(), usecols=None, cache_dir=None,
+                    row_numbers=False):
+    """
+    Yield {column: value} rows like excel_rows.iter_rows, from the sidecar when it is fresh;
+    with row_numbers=True, (worksheet row number, row) pairs.
+    On a miss the workbook is streamed and the sidecar is written CHUNK_ROWS rows at a time,
+    so at most one chunk of rows is buffered; `usecols` limits which columns are kept (and
+    cached), which keeps that first pass small. float_cols are converted with as_float().
+    """
+    float_cols = set(float_cols)
+    sidecar = sidecar_path(path, cache_dir, reader="rows", sheet=sheet_name, header=header, dtype=str(dtype),
+                           float_cols=sorted(float_cols), usecols=sorted(usecols) if usecols else None)
+    source_hash = file_hash(path)
+    cached = _open(sidecar, source_hash)
+    if cached is not None:
+        z, columns, meta = cached
+        with z:
+            for k in range(meta["chunks"]):
+                for excel_row, values in zip(z[f"k{k}rows"].tolist(), zip(*_chunk(z, f"k{k}", len(columns)))):
+                    row = dict(zip(columns, values))
+                    yield (excel_row, row) if row_numbers else row
+        return
+
+    columns, writer, buffer, numbers = None, None, [], []
+    try:
+        for excel_row, row in iter_rows(path, sheet_name=sheet_name, header=header, dtype=dtype, row_numbers=True):
+            if usecols:
+                row = {c: row[c] for c in row if c in usecols}
+            for c in float_cols & row.keys():
+                row[c] = as_float(row[c])
+            if columns is None:
+                columns = list(row)
+                writer = _SidecarWriter(sidecar, source_hash, path)
+            buffer.append([row[c] for c in columns])  ## Before the caller changes the row / قبل از تغییر ردیف
+            numbers.append(excel_row)
+            if len(buffer) >= CHUNK_ROWS:
+                writer.add_chunk([list(col) for col in zip(*buffer)], numbers)
+                buffer, numbers = [], []
+            yield (excel_row, row) if row_numbers else row
+
+        if writer is not None:
+            if buffer:
+                writer.add_chunk([list(col) for col in zip(*buffer)], numbers)
+            writer.finish(columns)
+    finally:
+        if writer is not None:
+            writer.abort()  ## Stopped early or failed: drop the partial sidecar / حذف فایل نیمه‌کاره
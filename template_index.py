@@ -0,0 +1,73 @@
+## ========================================================================================================
+## SUMMARY / خلاصه
+##
+## Index of the templates folder, built once at startup. find_template (edit15.py, "edit 11.py")
+## and find_template_for_name (edit.py) used to probe several os.path.exists candidates per row
+## and then scan os.listdir(TEMPLATES_DIR) with a case-insensitive prefix test. On a network
+## share with thousands of templates those directory calls dominate the runtime.
+##
+## The index keeps:
+## - a dict of file names, for the exact candidates (same case rules as os.path.exists)
+## - a sorted list of lower-case names, for the prefix fallback with bisect (O(log n))
+##
+## Note: the old prefix scan returned the first match in os.listdir order, which is not
+## specified (NTFS lists names sorted). The index returns the alphabetically first image among
+## the matches (IMAGE_EXTS), and only falls back to another file type when no image matches:
+## the folder also holds the .dxf/.sct of each section, and "box beam 1.56 x 2.0.dxf" sorts
+## before "box beam 1.56 x 2.0.png", which the scripts then could not open.
+## ========================================================================================================
+
+import os
+from bisect import bisect_left
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".bmp")  ## Preferred by the prefix fallback / اولویت با تصویر
+
+
+class TemplateIndex:
+    def __init__(self, templates_dir):
+        self.templates_dir = templates_dir
+        try:
+            files = os.listdir(templates_dir)
+        except FileNotFoundError:
+            files = []
+        ## normcase: case-insensitive on Windows, exact elsewhere, like os.path.exists
+        ## روی ویندوز بدون حساسیت به حروف بزرگ و کوچک، مثل os.path.exists
+        self._names = {os.path.normcase(f): f for f in files}
+        self._prefix = sorted((f.lower(), f) for f in files)
+        self._prefix_keys = [low for low, _ in self._prefix]
+
+    def __len__(self):
+        return len(self._names)
+
+    def path(self, fname):
+        return os.path.join(self.templates_dir, fname)
+
+    def exact(self, fname):
+        """Return the path of `fname` if it is in the folder, else None."""
+        found = self._names.get(os.path.normcase(fname))
+        return self.path(found) if found is not None else None
+
+    def startswith(self, prefix):
+        """Path of the first image whose lower-case name starts with `prefix`, else of the first
+        other file that does, else None."""
+        low = prefix.lower()
+        i = bisect_left(self._prefix_keys, low)
+        first = None
+        ## Matches are one contiguous run of the sorted list / تطابق‌ها پشت سر هم هستند
+        while i < len(self._prefix_keys) and self._prefix_keys[i].startswith(low):
+            if self._prefix_keys[i].endswith(IMAGE_EXTS):
+                return self.path(self._prefix[i][1])
+            if first is None:
+                first = self._prefix[i][1]
+            i += 1
+        return self.path(first) if first is not None else None
+
+    def find(self, candidates, prefix=None):
+        """First existing name in `candidates`, then the prefix fallback, with the old precedence."""
+        for c in candidates:
+            found = self.exact(c)
+            if found:
+                return found
+        if prefix is not None:
+            return self.startswith(prefix)
+        return None
@@ -5,16 +5,7 @@ from ezdxf.addons.drawing.matplotlib import MatplotlibBackend
 import io
 from PIL import Image
 
-def replace_blue_with_black(img):
-    pixels = img.load()
-    w, h = img.size
-    for x in range(w):
-        for y in range(h):
-            r, g, b, a = pixels[x, y]
-            if a > 0:
-                if b > 100 and b > r + 20 and b > g + 20:
-                    pixels[x, y] = (0, 0, 0, a)
-    return img
+from pixel_ops import replace_blue_with_black
 
 def render_dxf_to_png(dxf_path):
     doc = ezdxf.readfile(dxf_path)
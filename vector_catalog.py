@@ -0,0 +1,260 @@
+## ========================================================================================================
+## SUMMARY / خلاصه
+##
+## Vector drawings for the reportlab catalogs (main.py, edit.py). Those scripts put every
+## section on the page as a PNG through ImageReader, so each page carries a full raster.
+## When a DXF with the same name sits next to the PNG (templates/box beam 1.56 x 2.0.png ->
+## templates/box beam 1.56 x 2.0.dxf) and the PNG is only a plain render of that DXF,
+## catalog_image() returns a DxfDrawing instead: the DXF geometry is converted once into
+## reportlab path operators, stored in the PDF as a form XObject, and every page that shows
+## the section only references that form.
+##
+## The PNGs made by the e28 pipeline are annotated: Subshape, Th, the section name and the
+## coloured HL/WB/HR/WT labels are part of the bitmap, and the catalog rows do not carry those
+## values, so the DXF alone would lose them. Such a PNG is kept (as a shared bitmap form).
+## is_plain_render() tells them apart by the label colours: a PNG with more than
+## LABEL_MIN_PIXELS coloured pixels is treated as annotated. A render that keeps colourful DXF
+## layer colours is therefore also kept as a bitmap, which never loses content.
+##
+## USAGE / استفاده (same shape as the ImageReader code it replaces):
+##     img = catalog_image(img_path)              # DxfDrawing, or ImageReader when there is no DXF
+##     w, h = img.getSize()                       # DXF extents (or pixels)
+##     draw_catalog_image(c, img, x, y, draw_w, draw_h)
+##
+## Plain PNGs (no DXF next to them) are shared too: every file is read once by one cached
+## ImageReader and embedded once as a form XObject that holds the bitmap; every cell that
+## shows it only scales and references that form.
+##
+## Run this file directly for a size/time comparison of raster vs vector catalogs. So that both
+## show the same content, it first renders plain (unlabelled) PNGs of the DXFs in the folder
+## and builds every catalog from those:
+##     python vector_catalog.py templates 500
+## ========================================================================================================
+
+import os
+from itertools import count
+from weakref import WeakKeyDictionary
+
+import numpy as np
+from ezdxf import path as dxf_path_tools
+from ezdxf.path import Command
+from PIL import Image
+from reportlab.lib.utils import ImageReader
+
+import dxf_cache
+
+LINE_WIDTH = 0.6  ## Points, as printed / ضخامت خط روی کاغذ
+
+_forms = WeakKeyDictionary()  ## canvas -> {(dxf_path, w, h) or ImageReader: form name} / فرم‌های هر PDF
+_form_ids = count()
+_readers = {}  ## (path, mtime, size) -> ImageReader / هر تصویر یک بار خوانده می‌شود
+_plain = {}    ## (path, mtime, size) -> is_plain_render() result / نتیجه بررسی هر تصویر
+
+LABEL_SATURATION = 80  ## max - min channel of a label pixel (red, blue, green, orange, purple)
+LABEL_MIN_PIXELS = 50  ## Fewer coloured pixels than this is anti-aliasing noise / نویز لبه‌ها
+
+
+def dxf_for_image(img_path):
+    """The DXF next to a catalog PNG, or None."""
+    if not img_path:
+        return None
+    dxf = os.path.splitext(str(img_path))[0] + ".dxf"
+    return dxf if os.path.exists(dxf) else None
+
+
+def is_plain_render(img_path):
+    """True when the PNG has no coloured label pixels, i.e. it shows only the DXF geometry."""
+    st = os.stat(img_path)
+    key = (img_path, st.st_mtime_ns, st.st_size)
+    if key not in _plain:
+        with Image.open(img_path) as im:
+            rgb = np.asarray(im.convert("RGB"), dtype=np.int16)
+        coloured = int(((rgb.max(axis=2) - rgb.min(axis=2)) > LABEL_SATURATION).sum())
+        _plain[key] = coloured < LABEL_MIN_PIXELS
+    return _plain[key]
+
+
+## ---------- DXF geometry -> reportlab paths / تبدیل هندسه DXF به مسیرهای reportlab ----------
+class DxfDrawing:
+    """Modelspace of one DXF as ezdxf paths, drawn on a canvas through a cached form XObject."""
+
+    _cache = {}  ## (path, mtime, size) -> DxfDrawing / هر DXF یک بار تبدیل می‌شود
+
+    def __init__(self, dxf_path):
+        self.dxf_path = dxf_path
+        self.paths = []
+        for entity in dxf_cache.readfile(dxf_path).modelspace():
+            try:
+                p = dxf_path_tools.make_path(entity)
+            except TypeError:
+                continue  ## Text, dimensions, ... have no path / موجودیت بدون مسیر
+            if len(p):
+                self.paths.append(p)
+        box = dxf_path_tools.bbox(self.paths)
+        if not box.has_data:
+            raise ValueError(f"No drawable geometry in {dxf_path}")
+        self.min_x, self.min_y = box.extmin.x, box.extmin.y
+        self.width, self.height = box.size.x or 1.0, box.size.y or 1.0
+
+    @classmethod
+    def get(cls, dxf_path):
+        st = os.stat(dxf_path)
+        key = (dxf_path, st.st_mtime_ns, st.st_size)
+        if key not in cls._cache:
+            cls._cache[key] = cls(dxf_path)
+        return cls._cache[key]
+
+    def getSize(self):
+        """Extents in DXF units; like ImageReader.getSize() the caller scales them to the cell."""
+        return self.width, self.height
+
+    def _draw_paths(self, c, scale):
+        c.setLineWidth(LINE_WIDTH)
+        c.setLineJoin(1)
+        pdf_path = c.beginPath()
+
+        def pt(v):
+            return (v.x - self.min_x) * scale, (v.y - self.min_y) * scale
+
+        for p in self.paths:
+            last = p.start
+            pdf_path.moveTo(*pt(last))
+            for cmd in p.commands():
+                if cmd.type == Command.LINE_TO:
+                    pdf_path.lineTo(*pt(cmd.end))
+                elif cmd.type == Command.CURVE4_TO:
+                    pdf_path.curveTo(*pt(cmd.ctrl1), *pt(cmd.ctrl2), *pt(cmd.end))
+                elif cmd.type == Command.CURVE3_TO:
+                    ## Quadratic -> cubic Bezier / تبدیل منحنی درجه دو به درجه سه
+                    c1 = last + (cmd.ctrl - last) * (2 / 3)
+                    c2 = cmd.end + (cmd.ctrl - cmd.end) * (2 / 3)
+                    pdf_path.curveTo(*pt(c1), *pt(c2), *pt(cmd.end))
+                else:  ## MOVE_TO inside a multi-path / شروع زیرمسیر جدید
+                    pdf_path.moveTo(*pt(cmd.end))
+                last = cmd.end
+        c.drawPath(pdf_path, stroke=1, fill=0)
+
+    def drawOn(self, c, x, y, w, h):
+        """Draw the geometry scaled into the w x h box at (x, y), keeping its aspect ratio."""
+        scale = min(w / self.width, h / self.height)
+        form_w, form_h = round(self.width * scale, 2), round(self.height * scale, 2)
+        forms = _forms.setdefault(c, {})
+        key = (self.dxf_path, form_w, form_h)
+        name = forms.get(key)
+        if name is None:
+            ## Same section at the same size: one form, referenced from every page / یک فرم برای همه صفحه‌ها
+            name = forms[key] = f"dxf{next(_form_ids)}"
+            c.beginForm(name, 0, 0, form_w, form_h)
+            self._draw_paths(c, scale)
+            c.endForm()
+        c.saveState()
+        c.translate(x + (w - form_w) / 2, y + (h - form_h) / 2)
+        c.doForm(name)
+        c.restoreState()
+
+
+## ---------- Helpers used by the catalog scripts / توابع کمکی برای اسکریپت‌های کاتالوگ ----------
+def image_reader(img_path):
+    """One shared ImageReader per image file (re-read only when the file changes)."""
+    st = os.stat(img_path)
+    key = (img_path, st.st_mtime_ns, st.st_size)
+    if key not in _readers:
+        _readers[key] = ImageReader(img_path)
+    return _readers[key]
+
+
+def draw_image_form(c, img, x, y, w, h):
+    """Draw an ImageReader through one form XObject per canvas, scaled to w x h."""
+    forms = _forms.setdefault(c, {})
+    px_w, px_h = img.getSize()
+    name = forms.get(img)
+    if name is None:
+        ## Bitmap embedded once at 1 pt per pixel / تصویر یک بار در PDF ذخیره می‌شود
+        name = forms[img] = f"img{next(_form_ids)}"
+        c.beginForm(name, 0, 0, px_w, px_h)
+        c.drawImage(img, 0, 0, px_w, px_h)
+        c.endForm()
+    c.saveState()
+    c.translate(x, y)
+    c.scale(w / px_w, h / px_h)
+    c.doForm(name)
+    c.restoreState()
+
+
+def catalog_image(img_path):
+    """DxfDrawing when the PNG is a plain render of the DXF next to it, otherwise the shared ImageReader."""
+    dxf = dxf_for_image(img_path)
+    if dxf is not None and is_plain_render(img_path):
+        try:
+            return DxfDrawing.get(dxf)
+        except Exception as e:
+            print(f"Falling back to the PNG for {dxf}: {e}")
+    return image_reader(img_path)
+
+
+def draw_catalog_image(c, img, x, y, w, h):
+    """Vector form for a DxfDrawing, shared bitmap form for an ImageReader."""
+    if isinstance(img, DxfDrawing):
+        img.drawOn(c, x, y, w, h)
+    else:
+        draw_image_form(c, img, x, y, w, h)
+
+
+if __name__ == "__main__":
+    ## ---------- Benchmark: raster vs vector catalog / مقایسه کاتالوگ تصویری و برداری ----------
+    import shutil
+    import sys
+    import tempfile
+    import time
+
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import cm
+    from reportlab.pdfgen import canvas
+
+    from batch_render import RENDER_DPI, geometry_axes
+
+    folder = sys.argv[1] if len(sys.argv) > 1 else "templates"
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    out_dir = tempfile.mkdtemp()
+
+    ## Plain renders: the DXF geometry only, no labels, so raster and vector match / فقط هندسه
+    pngs = []
+    for name in sorted(f for f in os.listdir(folder) if f.lower().endswith(".dxf")):
+        png = os.path.join(out_dir, os.path.splitext(name)[0] + ".png")
+        fig, _ = geometry_axes(os.path.join(folder, name))
+        fig.savefig(png, dpi=RENDER_DPI, bbox_inches="tight")
+        shutil.copy(os.path.join(folder, name), out_dir)
+        pngs.append(png)
+    assert all(is_plain_render(p) for p in pngs)
+
+    def build(out, load, draw):
+        ## One section per page with the WT/WB/HR/HL labels, like main.py / مثل main.py
+        t0 = time.perf_counter()
+        c = canvas.Canvas(out, pagesize=A4)
+        page_w, page_h = A4
+        for i in range(pages):
+            img = load(pngs[i % len(pngs)])
+            w, h = img.getSize()
+            scale = min(10 * cm / w, 10 * cm / h)
+            w, h = w * scale, h * scale
+            x, y = (page_w - w) / 2, (page_h - h) / 2
+            c.setFont("Helvetica-Bold", 16)
+            c.drawCentredString(page_w / 2, page_h - 2 * cm, os.path.basename(pngs[i % len(pngs)]))
+            if draw is None:
+                c.drawImage(img, x, y, w, h, preserveAspectRatio=True)  ## Before / روش قبلی
+            else:
+                draw(c, img, x, y, w, h)
+            c.setFont("Helvetica", 12)
+            c.drawCentredString(page_w / 2, y + h + 0.5 * cm, "WT: 1.5")
+            c.drawCentredString(page_w / 2, y - 1 * cm, "WB: 1.5")
+            c.drawString(x + w + 0.5 * cm, y + h / 2, "HR: 2.0")
+            c.drawRightString(x - 0.5 * cm, y + h / 2, "HL: 2.0")
+            c.showPage()
+        c.save()
+        return time.perf_counter() - t0, os.path.getsize(out)
+
+    modes = (("raster", ImageReader, None), ("shared raster", image_reader, draw_image_form),
+             ("vector", catalog_image, draw_catalog_image))
+    for label, load, draw in modes:
+        seconds, size = build(os.path.join(out_dir, f"{label}.pdf"), load, draw)
+        print(f"{label:13s}: {pages} pages in {seconds:.2f}s, {size / 1024:.0f} KB ({size / pages / 1024:.1f} KB/page)")